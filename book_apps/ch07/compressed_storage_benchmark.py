@@ -0,0 +1,61 @@
+import os, random, tempfile, time
+from itertools import islice
+
+import movie_storage
+
+# compares the size and read speed of the compressed movie storage
+# with a plain CSV file
+
+MOVIE_COUNT = 200000
+LOOKUPS = 20
+
+def make_movies(count):
+    movies = []
+    for i in range(count):
+        movies.append([f"The Adventures of Movie Number {i}", str(1900 + i % 120)])
+    return movies
+
+def time_ms(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+def get_size(storage):
+    size = os.path.getsize(storage.filename)
+    if hasattr(storage, "index_filename"):
+        size += os.path.getsize(storage.index_filename)
+    return size
+
+def main():
+    movies = make_movies(MOVIE_COUNT)
+    numbers = [random.randint(1, MOVIE_COUNT) for i in range(LOOKUPS)]
+    print(f"{MOVIE_COUNT:,} movies, {LOOKUPS} single-movie lookups, "
+          f"one 500-movie range (times in ms)")
+    print()
+    print(f"{'Format':8}{'size KB':>10}{'write':>10}{'read all':>10}"
+          f"{'lookups':>10}{'range':>10}")
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            for extension in (".csv", ".zlib", ".xz"):
+                storage = movie_storage.get_storage("movies" + extension)
+                write_time = time_ms(lambda: storage.write(movies))
+                read_time = time_ms(storage.read)
+                if extension == ".csv":
+                    # a CSV file has to be read up to the movie that's wanted
+                    lookup_time = time_ms(lambda: [next(islice(storage.iterate(), n - 1, None))
+                                                   for n in numbers])
+                    range_time = time_ms(lambda: list(islice(storage.iterate(), 99999, 100499)))
+                else:
+                    lookup_time = time_ms(lambda: [storage.get(n) for n in numbers])
+                    range_time = time_ms(lambda: storage.get_range(100000, 100499))
+                print(f"{extension:8}{get_size(storage) / 1024:10.0f}{write_time:10.1f}"
+                      f"{read_time:10.1f}{lookup_time:10.1f}{range_time:10.1f}")
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
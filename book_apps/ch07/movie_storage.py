@@ -0,0 +1,355 @@
+import csv
+import io
+import lzma
+import os
+import pickle
+import sqlite3
+import struct
+import zlib
+from bisect import bisect_right
+from contextlib import closing
+
+import movies3
+
+# Storage classes that all keep a movie list of [name, year] lists in a
+# file. They share the same methods, so a program can use any of them:
+#   read()          - return every movie in a list
+#   iterate()       - yield the movies one at a time
+#   append(movie)   - add a movie to the end of the list
+#   delete(number)  - delete and return the movie with that number (1, 2, ...)
+
+class Storage:
+    def __init__(self, filename):
+        self.filename = filename
+
+    def read(self):
+        return list(self.iterate())
+
+    def iterate(self):
+        raise NotImplementedError()
+
+    def write(self, movies):
+        raise NotImplementedError()
+
+    def append(self, movie):
+        movies = self.read()
+        movies.append(movie)
+        self.write(movies)
+
+    def delete(self, number):
+        movies = self.read()
+        if number < 1 or number > len(movies):
+            raise IndexError("movie number out of range")
+        movie = movies.pop(number - 1)
+        self.write(movies)
+        return movie
+
+    def exists(self):
+        return os.path.exists(self.filename)
+
+class CsvStorage(Storage):
+    def iterate(self):
+        if not self.exists():
+            return
+        with open(self.filename, newline="") as file:
+            for row in csv.reader(file):
+                yield row
+
+    def write(self, movies):
+        with open(self.filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerows(movies)
+
+    def append(self, movie):
+        with open(self.filename, "a", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(movie)
+
+class TextStorage(Storage):
+    # one movie per line with the name and year separated by a pipe
+    def iterate(self):
+        if not self.exists():
+            return
+        with open(self.filename) as file:
+            for line in file:
+                movie = line.replace("\n", "").split("|")
+                if len(movie) == 1:
+                    movie.append("")   # the file only has names
+                yield movie
+
+    def write(self, movies):
+        with open(self.filename, "w") as file:
+            for movie in movies:
+                file.write(f"{movie[0]}|{movie[1]}\n")
+
+    def append(self, movie):
+        with open(self.filename, "a") as file:
+            file.write(f"{movie[0]}|{movie[1]}\n")
+
+class PickleStorage(Storage):
+    # the whole movie list is pickled as one object
+    def read(self):
+        if not self.exists():
+            return []
+        with open(self.filename, "rb") as file:
+            return pickle.load(file)
+
+    def iterate(self):
+        for movie in self.read():
+            yield movie
+
+    def write(self, movies):
+        with open(self.filename, "wb") as file:
+            pickle.dump(movies, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+class RecordStorage(Storage):
+    # one length-prefixed pickle record per movie, as in movies3.py
+    def is_record_file(self):
+        with open(self.filename, "rb") as file:
+            return file.read(len(movies3.MAGIC)) == movies3.MAGIC
+
+    def iterate(self):
+        if not self.exists():
+            return
+        with open(self.filename, "rb") as file:
+            if file.read(len(movies3.MAGIC)) != movies3.MAGIC:
+                # a file written before movies3.py switched to records
+                file.seek(0)
+                for movie in pickle.load(file):
+                    yield movie
+                return
+            while True:
+                movie = movies3.read_record(file)
+                if movie is None:
+                    break
+                yield movie
+
+    def write(self, movies):
+        # movies3.py keeps an index of where each record starts,
+        # so the index is written along with the records
+        movies3.write_movies(movies, self.filename)
+
+    def append(self, movie):
+        if not self.exists() or not self.is_record_file():
+            self.write(self.read())
+        elif not movies3.index_is_valid(self.filename):
+            movies3.build_index(self.filename)
+        movies3.append_movie(movie, self.filename)
+
+class SqliteStorage(Storage):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.conn = sqlite3.connect(filename)
+        with self.conn:
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS Movie (
+                                     movieID INTEGER PRIMARY KEY,
+                                     name    TEXT NOT NULL,
+                                     year    TEXT NOT NULL)''')
+
+    def close(self):
+        self.conn.close()
+
+    def iterate(self):
+        with closing(self.conn.cursor()) as c:
+            c.execute("SELECT name, year FROM Movie ORDER BY movieID")
+            for row in c:
+                yield [row[0], row[1]]
+
+    def write(self, movies):
+        with self.conn:
+            self.conn.execute("DELETE FROM Movie")
+            self.conn.executemany("INSERT INTO Movie (name, year) VALUES (?, ?)",
+                                  [(movie[0], movie[1]) for movie in movies])
+
+    def append(self, movie):
+        with self.conn:
+            self.conn.execute("INSERT INTO Movie (name, year) VALUES (?, ?)",
+                              (movie[0], movie[1]))
+
+    def delete(self, number):
+        if number < 1:
+            raise IndexError("movie number out of range")
+        with self.conn:
+            with closing(self.conn.cursor()) as c:
+                c.execute('''SELECT movieID, name, year FROM Movie
+                             ORDER BY movieID LIMIT 1 OFFSET ?''', (number - 1,))
+                row = c.fetchone()
+                if row is None:
+                    raise IndexError("movie number out of range")
+                c.execute("DELETE FROM Movie WHERE movieID = ?", (row[0],))
+        return [row[1], row[2]]
+
+class CompressedStorage(Storage):
+    # Movies are stored as CSV text in compressed blocks of up to BLOCK_SIZE
+    # movies. The index file holds the position, compressed length, and
+    # movie count of each block, so one movie or a range of movies can be
+    # read by decompressing only the blocks that hold them. Changed blocks
+    # are written to the end of the file, and the file is compacted once
+    # more than GARBAGE_RATIO of it is old copies of blocks.
+    BLOCK_SIZE = 1000
+    GARBAGE_RATIO = 0.5
+    BLOCK = struct.Struct("<QII")
+    COMPRESSORS = {
+        "zlib": (zlib.compress, zlib.decompress),
+        "lzma": (lzma.compress, lzma.decompress),
+    }
+
+    def __init__(self, filename, compression="zlib"):
+        super().__init__(filename)
+        self.index_filename = filename + ".idx"
+        self.compress, self.decompress = self.COMPRESSORS[compression]
+        self.blocks = []   # [offset, length, count] for each block
+        if self.exists():
+            # the file can hold old copies of blocks, so which blocks
+            # are in use can't be worked out again without the index
+            if not os.path.exists(self.index_filename):
+                raise FileNotFoundError(
+                    f"{filename} can't be read without its index file "
+                    f"{self.index_filename}, which is missing.")
+            with open(self.index_filename, "rb") as file:
+                data = file.read()
+            for values in self.BLOCK.iter_unpack(data):
+                self.blocks.append(list(values))
+
+    def pack_block(self, movies):
+        text = io.StringIO(newline="")
+        csv.writer(text).writerows(movies)
+        return self.compress(text.getvalue().encode("utf-8"))
+
+    def read_block(self, file, block_number):
+        offset, length, count = self.blocks[block_number]
+        file.seek(offset)
+        text = self.decompress(file.read(length)).decode("utf-8")
+        return [row for row in csv.reader(io.StringIO(text, newline=""))]
+
+    def write_block(self, block_number, movies):
+        # write a block to the end of the file and point the index at it
+        data = self.pack_block(movies)
+        with open(self.filename, "ab") as file:
+            file.seek(0, os.SEEK_END)
+            offset = file.tell()
+            file.write(data)
+        block = [offset, len(data), len(movies)]
+        if block_number == len(self.blocks):
+            self.blocks.append(block)
+        elif len(movies) == 0:
+            del self.blocks[block_number]
+        else:
+            self.blocks[block_number] = block
+        self.write_index()
+
+        file_size = offset + len(data)
+        garbage = file_size - sum(block[1] for block in self.blocks)
+        if garbage > file_size * self.GARBAGE_RATIO:
+            self.compact()
+
+    def compact(self):
+        # copy the blocks in use to a new file without decompressing them
+        temp_filename = self.filename + ".tmp"
+        blocks = []
+        with open(self.filename, "rb") as file, open(temp_filename, "wb") as temp:
+            for offset, length, count in self.blocks:
+                file.seek(offset)
+                blocks.append([temp.tell(), length, count])
+                temp.write(file.read(length))
+        os.replace(temp_filename, self.filename)
+        self.blocks = blocks
+        self.write_index()
+
+    def write_index(self):
+        with open(self.index_filename, "wb") as file:
+            for block in self.blocks:
+                file.write(self.BLOCK.pack(*block))
+
+    def find_block(self, number):
+        # return the block holding movie number and the movie's index in it
+        starts = []
+        total = 0
+        for block in self.blocks:
+            starts.append(total)
+            total += block[2]
+        if number < 1 or number > total:
+            raise IndexError("movie number out of range")
+        block_number = bisect_right(starts, number - 1) - 1
+        return block_number, number - 1 - starts[block_number]
+
+    def count(self):
+        return sum(block[2] for block in self.blocks)
+
+    def iterate(self):
+        if not self.exists():
+            return
+        with open(self.filename, "rb") as file:
+            for block_number in range(len(self.blocks)):
+                for movie in self.read_block(file, block_number):
+                    yield movie
+
+    def get(self, number):
+        block_number, position = self.find_block(number)
+        with open(self.filename, "rb") as file:
+            return self.read_block(file, block_number)[position]
+
+    def get_range(self, start, end):
+        # return movies start through end, decompressing only their blocks
+        movies = []
+        start_block, start_position = self.find_block(start)
+        end_block, end_position = self.find_block(end)
+        with open(self.filename, "rb") as file:
+            for block_number in range(start_block, end_block + 1):
+                block = self.read_block(file, block_number)
+                first = start_position if block_number == start_block else 0
+                last = end_position + 1 if block_number == end_block else len(block)
+                movies.extend(block[first:last])
+        return movies
+
+    def write(self, movies):
+        self.blocks = []
+        with open(self.filename, "wb") as file:
+            for i in range(0, len(movies), self.BLOCK_SIZE):
+                data = self.pack_block(movies[i:i + self.BLOCK_SIZE])
+                self.blocks.append([file.tell(), len(data),
+                                    len(movies[i:i + self.BLOCK_SIZE])])
+                file.write(data)
+        self.write_index()
+
+    def append(self, movie):
+        if not self.exists():
+            self.write([])
+        if len(self.blocks) > 0 and self.blocks[-1][2] < self.BLOCK_SIZE:
+            block_number = len(self.blocks) - 1
+            with open(self.filename, "rb") as file:
+                movies = self.read_block(file, block_number)
+        else:
+            block_number = len(self.blocks)
+            movies = []
+        movies.append(list(movie))
+        self.write_block(block_number, movies)
+
+    def delete(self, number):
+        block_number, position = self.find_block(number)
+        with open(self.filename, "rb") as file:
+            movies = self.read_block(file, block_number)
+        movie = movies.pop(position)
+        self.write_block(block_number, movies)
+        return movie
+
+class LzmaStorage(CompressedStorage):
+    def __init__(self, filename):
+        super().__init__(filename, "lzma")
+
+STORAGE_TYPES = {
+    ".csv": CsvStorage,
+    ".txt": TextStorage,
+    ".pkl": PickleStorage,
+    ".bin": RecordStorage,
+    ".sqlite": SqliteStorage,
+    ".zlib": CompressedStorage,
+    ".xz": LzmaStorage,
+}
+
+def get_storage(filename):
+    # choose the storage class from the file extension
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in STORAGE_TYPES:
+        raise ValueError(f"Unknown movie file type: {extension}")
+    return STORAGE_TYPES[extension](filename)
@@ -0,0 +1,55 @@
+import os, tempfile, time
+
+import movie_storage
+
+# times the same operations on every storage class for several list
+# sizes so the fastest format for a given size can be chosen
+
+SIZES = [1000, 10000, 100000]
+
+def make_movies(count):
+    movies = []
+    for i in range(count):
+        movies.append([f"Movie number {i}", str(1900 + i % 120)])
+    return movies
+
+def time_ms(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+def benchmark(storage, movies):
+    times = []
+    times.append(time_ms(storage.write, movies))
+    times.append(time_ms(storage.read))
+    times.append(time_ms(lambda: sum(1 for movie in storage.iterate())))
+    times.append(time_ms(storage.append, ["One more movie", "2024"]))
+    times.append(time_ms(storage.delete, len(movies) // 2))
+    return times
+
+def main():
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            for size in SIZES:
+                movies = make_movies(size)
+                print(f"{size:,} movies (times in ms)")
+                print(f"{'Format':10}{'write':>10}{'read':>10}{'iterate':>10}"
+                      f"{'append':>10}{'delete':>10}")
+                for extension, storage_type in movie_storage.STORAGE_TYPES.items():
+                    storage = storage_type(f"movies_{size}{extension}")
+                    times = benchmark(storage, movies)
+                    if hasattr(storage, "close"):
+                        storage.close()
+                    line = f"{extension:10}"
+                    for t in times:
+                        line += f"{t:10.2f}"
+                    print(line)
+                print()
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,129 @@
+import os
 import pickle
+import struct
 
 FILENAME = "movies.bin"
+INDEX_FILENAME = "movies.idx"
 
-def write_movies(movies):
-    with open(FILENAME, "wb") as file:
-        pickle.dump(movies, file)
+# The movies file starts with MAGIC and then holds one record per movie:
+# the length of the pickled movie followed by the pickled movie.
+# The index file holds the position of each record in the movies file,
+# so any movie can be read without reading the ones before it.
+MAGIC = b"MOVIES1\n"
+LENGTH = struct.Struct("<I")
+OFFSET = struct.Struct("<Q")
 
-def read_movies():
+def get_index_filename(filename):
+    # the index for movies.bin is movies.idx
+    return os.path.splitext(filename)[0] + ".idx"
+
+def write_movies(movies, filename=FILENAME):
+    offsets = bytearray()
+    with open(filename, "wb") as file:
+        file.write(MAGIC)
+        for movie in movies:
+            offsets += OFFSET.pack(file.tell())
+            write_record(file, movie)
+    with open(get_index_filename(filename), "wb") as file:
+        file.write(offsets)
+
+def write_record(file, movie):
+    data = pickle.dumps(movie, protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(LENGTH.pack(len(data)))
+    file.write(data)
+
+def read_record(file):
+    # return the next movie in the file or None at the end of the file
+    header = file.read(LENGTH.size)
+    if len(header) < LENGTH.size:
+        return None
+    length = LENGTH.unpack(header)[0]
+    return pickle.loads(file.read(length))
+
+def convert_movies():
+    # convert a file that holds the whole movie list as one pickle
     with open(FILENAME, "rb") as file:
+        if file.read(len(MAGIC)) == MAGIC:
+            return
+        file.seek(0)
         movies = pickle.load(file)
-    return movies
+    write_movies(movies)
+
+def build_index(filename=FILENAME):
+    offsets = bytearray()
+    with open(filename, "rb") as file:
+        file.seek(len(MAGIC))
+        while True:
+            offset = file.tell()
+            header = file.read(LENGTH.size)
+            if len(header) < LENGTH.size:
+                break
+            offsets += OFFSET.pack(offset)
+            file.seek(LENGTH.unpack(header)[0], os.SEEK_CUR)
+    with open(get_index_filename(filename), "wb") as file:
+        file.write(offsets)
+
+def index_is_valid(filename=FILENAME):
+    # The index is out of date if another program changed the movies
+    # file without it, so check that the last offset in it points to a
+    # record that ends at the end of the file.
+    index_filename = get_index_filename(filename)
+    if not os.path.exists(index_filename):
+        return False
+    index_size = os.path.getsize(index_filename)
+    if index_size % OFFSET.size != 0:
+        return False
+    file_size = os.path.getsize(filename)
+    if index_size == 0:
+        return file_size == len(MAGIC)
+    with open(index_filename, "rb") as file:
+        file.seek(index_size - OFFSET.size)
+        offset = OFFSET.unpack(file.read(OFFSET.size))[0]
+    with open(filename, "rb") as file:
+        file.seek(offset)
+        header = file.read(LENGTH.size)
+    if len(header) < LENGTH.size:
+        return False
+    return offset + LENGTH.size + LENGTH.unpack(header)[0] == file_size
+
+def open_movies():
+    convert_movies()
+    if not index_is_valid():
+        build_index()
+
+def iter_movies():
+    with open(FILENAME, "rb") as file:
+        file.seek(len(MAGIC))
+        while True:
+            movie = read_record(file)
+            if movie is None:
+                break
+            yield movie
+
+def read_movies():
+    return list(iter_movies())
+
+def count_movies():
+    return os.path.getsize(INDEX_FILENAME) // OFFSET.size
+
+def read_movie(number):
+    with open(INDEX_FILENAME, "rb") as file:
+        file.seek((number - 1) * OFFSET.size)
+        offset = OFFSET.unpack(file.read(OFFSET.size))[0]
+    with open(FILENAME, "rb") as file:
+        file.seek(offset)
+        return read_record(file)
+
+def append_movie(movie, filename=FILENAME):
+    with open(filename, "ab") as file:
+        file.seek(0, os.SEEK_END)
+        offset = file.tell()
+        write_record(file, movie)
+    with open(get_index_filename(filename), "ab") as file:
+        file.write(OFFSET.pack(offset))
 
 def list_movies():
-    movies = read_movies()
-    for i, movie in enumerate(movies, start=1):
+    for i, movie in enumerate(iter_movies(), start=1):
         print(f"{i}. {movie[0]} ({movie[1]})")
     print()
 
@@ -21,16 +131,15 @@ def add_movie():
     name = input("Name: ")
     year = input("Year: ")
     movie = [name, year]
-    movie_list = read_movies()
-    movie_list.append(movie)
-    write_movies(movie_list)
+    append_movie(movie)
     print(f"{name} was added.\n")
 
 def delete_movie():
     index = int(input("Number: "))
-    if index < 1 or index > len(movies):
+    if index < 1 or index > count_movies():
         print("Invalid movie number.\n")
     else:
+        movies = read_movies()
         movie = movies.pop(index - 1)
         write_movies(movies)
         print(f"{movie[0]} was deleted.\n")
@@ -47,6 +156,7 @@ def display_menu():
 
 def main():
     display_menu()
+    open_movies()
     while True:        
         command = input("Command: ")
         if command.lower() == "list":
@@ -0,0 +1,173 @@
+import csv
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+import movies3
+
+FILENAME = "movies.dat"
+HEAP_FILENAME = "movies.str"
+
+# movies.dat starts with MAGIC and then holds one fixed-size record per
+# movie: the position and length of the movie's name in movies.str and
+# the movie's year. Because every record is the same size, movie i is
+# always at the same position and can be read without reading the others.
+MAGIC = b"MOVFIX1\n"
+RECORD = struct.Struct("<QIh2x")
+
+def create_files():
+    with open(FILENAME, "wb") as file:
+        file.write(MAGIC)
+    open(HEAP_FILENAME, "wb").close()
+
+def open_map(filename):
+    # an empty file can't be mapped, so return an empty bytes object instead
+    with open(filename, "rb") as file:
+        if os.path.getsize(filename) == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def count_movies():
+    return (os.path.getsize(FILENAME) - len(MAGIC)) // RECORD.size
+
+def get_movie(records, heap, number):
+    position = len(MAGIC) + (number - 1) * RECORD.size
+    offset, length, year = RECORD.unpack_from(records, position)
+    name = heap[offset:offset + length].decode("utf-8")
+    return [name, year]
+
+def read_movie(number):
+    records = open_map(FILENAME)
+    heap = open_map(HEAP_FILENAME)
+    return get_movie(records, heap, number)
+
+def iter_movies():
+    records = open_map(FILENAME)
+    heap = open_map(HEAP_FILENAME)
+    for number in range(1, count_movies() + 1):
+        yield get_movie(records, heap, number)
+
+def append_movie(movie):
+    name = movie[0].encode("utf-8")
+    with open(HEAP_FILENAME, "ab") as file:
+        file.seek(0, os.SEEK_END)
+        offset = file.tell()
+        file.write(name)
+    with open(FILENAME, "ab") as file:
+        file.write(RECORD.pack(offset, len(name), int(movie[1])))
+
+def remove_movie(number):
+    # move the following records down over the deleted one and shorten
+    # the file (the name stays in movies.str until the files are rebuilt)
+    count = count_movies()
+    position = len(MAGIC) + (number - 1) * RECORD.size
+    end = len(MAGIC) + count * RECORD.size
+    with open(FILENAME, "r+b") as file:
+        with mmap.mmap(file.fileno(), 0) as records:
+            movie_record = records[position:position + RECORD.size]
+            records.move(position, position + RECORD.size,
+                         end - position - RECORD.size)
+            records.flush()
+        file.truncate(end - RECORD.size)
+    offset, length, year = RECORD.unpack(movie_record)
+    heap = open_map(HEAP_FILENAME)
+    return [heap[offset:offset + length].decode("utf-8"), year]
+
+def write_movies(movies):
+    create_files()
+    for movie in movies:
+        append_movie(movie)
+
+def read_source(filename):
+    # read movies from a CSV, pipe-delimited text, or pickle file
+    if filename.endswith(".csv"):
+        with open(filename, newline="") as file:
+            return [row for row in csv.reader(file)]
+    elif filename.endswith(".txt"):
+        movies = []
+        with open(filename) as file:
+            for line in file:
+                movie = line.replace("\n", "").split("|")
+                if len(movie) == 1:
+                    movie.append(0)   # the file only has names
+                movies.append(movie)
+        return movies
+    elif filename.endswith(".bin"):
+        with open(filename, "rb") as file:
+            if file.read(len(movies3.MAGIC)) != movies3.MAGIC:
+                file.seek(0)
+                return pickle.load(file)
+            movies = []
+            while True:
+                movie = movies3.read_record(file)
+                if movie is None:
+                    return movies
+                movies.append(movie)
+    else:
+        raise ValueError(f"Unknown file type: {filename}")
+
+def convert(filename):
+    movies = read_source(filename)
+    write_movies(movies)
+    print(f"{len(movies)} movies converted from {filename}.\n")
+
+def list_movies():
+    for i, movie in enumerate(iter_movies(), start=1):
+        print(f"{i}. {movie[0]} ({movie[1]})")
+    print()
+
+def add_movie():
+    name = input("Name: ")
+    try:
+        year = int(input("Year: "))
+    except ValueError:
+        print("Invalid year.\n")
+        return
+    movie = [name, year]
+    append_movie(movie)
+    print(f"{name} was added.\n")
+
+def delete_movie():
+    index = int(input("Number: "))
+    if index < 1 or index > count_movies():
+        print("Invalid movie number.\n")
+    else:
+        movie = remove_movie(index)
+        print(f"{movie[0]} was deleted.\n")
+
+def display_menu():
+    print("The Movie List program")
+    print()
+    print("COMMAND MENU")
+    print("list - List all movies")
+    print("add -  Add a movie")
+    print("del -  Delete a movie")
+    print("exit - Exit program")
+    print()
+
+def main():
+    # to convert an existing file:  python movies4.py movies.csv
+    if len(sys.argv) > 1:
+        convert(sys.argv[1])
+    elif not os.path.exists(FILENAME):
+        convert("movies.csv")
+
+    display_menu()
+    while True:
+        command = input("Command: ")
+        if command.lower() == "list":
+            list_movies()
+        elif command.lower() == "add":
+            add_movie()
+        elif command.lower() == "del":
+            delete_movie()
+        elif command.lower() == "exit":
+            break
+        else:
+            print("Not a valid command. Please try again.\n")
+    print("Bye!")
+
+if __name__ == "__main__":
+    main()
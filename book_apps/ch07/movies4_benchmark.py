@@ -0,0 +1,74 @@
+import csv, os, pickle, random, tempfile, time
+
+import movies4
+
+# compares reading a movie list stored as CSV, pipe-delimited text,
+# a pickled list, and the fixed-width records used by movies4.py
+
+MOVIE_COUNT = 200000
+LOOKUPS = 1000
+
+def make_movies(count):
+    movies = []
+    for i in range(count):
+        movies.append([f"Movie number {i}", 1900 + i % 120])
+    return movies
+
+def timed(label, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{label:40} {elapsed * 1000:10.2f} ms")
+
+def read_csv():
+    with open("movies.csv", newline="") as file:
+        return [row for row in csv.reader(file)]
+
+def read_txt():
+    with open("movies.txt") as file:
+        return [line.replace("\n", "").split("|") for line in file]
+
+def read_bin():
+    with open("movies.bin", "rb") as file:
+        return pickle.load(file)
+
+def main():
+    movies = make_movies(MOVIE_COUNT)
+    numbers = [random.randint(1, MOVIE_COUNT) for i in range(LOOKUPS)]
+    print(f"{MOVIE_COUNT:,} movies, {LOOKUPS:,} lookups by number")
+    print()
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            with open("movies.csv", "w", newline="") as file:
+                csv.writer(file).writerows(movies)
+            with open("movies.txt", "w") as file:
+                for movie in movies:
+                    file.write(f"{movie[0]}|{movie[1]}\n")
+            with open("movies.bin", "wb") as file:
+                pickle.dump(movies, file)
+            movies4.write_movies(movies)
+
+            timed("CSV: read all", read_csv)
+            timed("Text: read all", read_txt)
+            timed("Pickle: read all", read_bin)
+            timed("Fixed-width: read all", lambda: list(movies4.iter_movies()))
+            print()
+            timed("CSV: read all to look up one movie",
+                  lambda: read_csv()[numbers[0] - 1])
+            timed("Fixed-width: look up one at a time",
+                  lambda: [movies4.read_movie(n) for n in numbers])
+            records = movies4.open_map(movies4.FILENAME)
+            heap = movies4.open_map(movies4.HEAP_FILENAME)
+            timed("Fixed-width: look up with open maps",
+                  lambda: [movies4.get_movie(records, heap, n) for n in numbers])
+            records.close()
+            heap.close()
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import sys
+
+from movie_storage import get_storage
+
+# the movie file to use, which also selects how it's stored:
+#   python movies5.py movies.txt
+FILENAME = "movies.csv"
+
+def list_movies(storage):
+    for i, movie in enumerate(storage.iterate(), start=1):
+        print(f"{i}. {movie[0]} ({movie[1]})")
+    print()
+
+def add_movie(storage):
+    name = input("Name: ")
+    year = input("Year: ")
+    movie = [name, year]
+    storage.append(movie)
+    print(f"{name} was added.\n")
+
+def delete_movie(storage):
+    index = int(input("Number: "))
+    try:
+        movie = storage.delete(index)
+        print(f"{movie[0]} was deleted.\n")
+    except IndexError:
+        print("Invalid movie number.\n")
+
+def display_menu():
+    print("The Movie List program")
+    print()
+    print("COMMAND MENU")
+    print("list - List all movies")
+    print("add -  Add a movie")
+    print("del -  Delete a movie")
+    print("exit - Exit program")
+    print()
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else FILENAME
+    try:
+        storage = get_storage(filename)
+    except (ValueError, FileNotFoundError) as e:
+        print(e)
+        return
+    display_menu()
+    while True:
+        command = input("Command: ")
+        if command.lower() == "list":
+            list_movies(storage)
+        elif command.lower() == "add":
+            add_movie(storage)
+        elif command.lower() == "del":
+            delete_movie(storage)
+        elif command.lower() == "exit":
+            break
+        else:
+            print("Not a valid command. Please try again.\n")
+    print("Bye!")
+
+if __name__ == "__main__":
+    main()
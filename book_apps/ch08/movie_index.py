@@ -0,0 +1,102 @@
+import os
+import pickle
+from bisect import bisect_left, bisect_right
+
+# A MovieIndex keeps the movies sorted by name and by year, so bisect
+# can find movies by name prefix or by year range in O(log n) time.
+# It's saved next to the CSV file with the CSV file's size and
+# modification time, so it's only rebuilt when the CSV file has
+# been changed by something other than this program. The saved index
+# also holds a format version, so an index saved by an older version
+# of the program (which kept the years as strings) is rebuilt too.
+
+INDEX_VERSION = 2
+
+def get_year(movie):
+    try:
+        return int(movie[1])
+    except ValueError:
+        return None   # years that aren't numbers can't be searched by year
+
+class MovieIndex:
+    def __init__(self, movies=None):
+        self.name_keys = []     # lowercase names in sorted order
+        self.name_movies = []   # the movie for each name key
+        self.year_keys = []     # years in sorted order
+        self.year_movies = []   # the movie for each year key
+        if movies:
+            self.build(movies)
+
+    def build(self, movies):
+        by_name = sorted(movies, key=lambda movie: movie[0].lower())
+        self.name_keys = [movie[0].lower() for movie in by_name]
+        self.name_movies = [list(movie) for movie in by_name]
+
+        by_year = sorted((movie for movie in movies if get_year(movie) is not None),
+                         key=get_year)
+        self.year_keys = [get_year(movie) for movie in by_year]
+        self.year_movies = [list(movie) for movie in by_year]
+
+    def add(self, movie):
+        key = movie[0].lower()
+        index = bisect_right(self.name_keys, key)
+        self.name_keys.insert(index, key)
+        self.name_movies.insert(index, list(movie))
+
+        year = get_year(movie)
+        if year is not None:
+            index = bisect_right(self.year_keys, year)
+            self.year_keys.insert(index, year)
+            self.year_movies.insert(index, list(movie))
+
+    def remove(self, movie):
+        self.remove_key(self.name_keys, self.name_movies, movie[0].lower(), movie)
+        year = get_year(movie)
+        if year is not None:
+            self.remove_key(self.year_keys, self.year_movies, year, movie)
+
+    def remove_key(self, keys, movies, key, movie):
+        index = bisect_left(keys, key)
+        while index < len(keys) and keys[index] == key:
+            if movies[index] == list(movie):
+                del keys[index]
+                del movies[index]
+                return
+            index += 1
+        raise ValueError(f"{movie[0]} ({movie[1]}) is not in the index")
+
+    def find_by_name(self, prefix):
+        prefix = prefix.lower()
+        start = bisect_left(self.name_keys, prefix)
+        found = []
+        for index in range(start, len(self.name_keys)):
+            if not self.name_keys[index].startswith(prefix):
+                break
+            found.append(self.name_movies[index])
+        return found
+
+    def find_by_year(self, start_year, end_year):
+        start = bisect_left(self.year_keys, start_year)
+        end = bisect_right(self.year_keys, end_year)
+        return self.year_movies[start:end]
+
+def get_file_stamp(filename):
+    stat = os.stat(filename)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def save_index(index, filename, csv_filename):
+    with open(filename, "wb") as file:
+        pickle.dump((INDEX_VERSION, get_file_stamp(csv_filename), index), file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_index(filename, csv_filename, movies):
+    # return the saved index, or build a new one if the CSV file
+    # changed or the index was saved in an older format
+    try:
+        with open(filename, "rb") as file:
+            version, stamp, index = pickle.load(file)
+        if version == INDEX_VERSION and stamp == get_file_stamp(csv_filename):
+            return index
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+    return MovieIndex(movies)
@@ -1,19 +1,67 @@
 import csv
 import sys
+from difflib import SequenceMatcher
+
+from csv_schema import Field, RowError, Schema, write_rejects
+from movie_index import get_file_stamp, load_index, save_index
 
 FILENAME = "movies.csv"
+REJECT_FILENAME = "rejects.log"
+INDEX_FILENAME = "movies_index.bin"
+WATCH = True   # reload movies that another program changes in the file
 
 def exit_program():
     print("Terminating program.")
     sys.exit()
 
+# Added movies are appended to the file and deleted movies are marked
+# by appending a tombstone row, so a change doesn't rewrite the file.
+# The file is rewritten (compacted) once too much of it is garbage.
+TOMBSTONE = "~deleted~"
+GARBAGE_RATIO = 0.5
+
+MOVIE_SCHEMA = Schema(
+    # a movie named TOMBSTONE would be read back as a deleted movie
+    Field("name", str, lambda name: name not in ("", TOMBSTONE),
+          "is empty or marks a deleted movie"),
+    Field("year", int, lambda year: 1800 <= year <= 2100, "is not a valid year"))
+
+row_numbers = []   # the file row number of each movie in the movie list
+file_rows = 0      # rows in the file, including deleted movies and tombstones
+rejected_rows = [] # rows that aren't valid movies, kept when the file is rewritten
+
 def read_movies():
+    global row_numbers, file_rows
     try:
-        movies = []
+        rows = []
+        deleted = set()
         with open(FILENAME, newline="") as file:
             reader = csv.reader(file)
-            for row in reader:
-                movies.append(row)
+            for row_number, row in enumerate(reader):
+                if len(row) > 0 and row[0] == TOMBSTONE:
+                    deleted.add(int(row[1]))
+                else:
+                    rows.append((row_number, reader.line_num, row))
+            file_rows = row_number + 1 if rows or deleted else 0
+
+        movies = []
+        row_numbers = []
+        rejects = []
+        for row_number, line_number, row in rows:
+            if row_number in deleted:
+                continue
+            try:
+                movies.append(MOVIE_SCHEMA.decode_row(row))
+                row_numbers.append(row_number)
+            except RowError as e:
+                rejects.append((line_number, e, row))
+        rejected_rows[:] = [row for line_number, e, row in rejects]
+
+        # the log is rewritten, so reading the file again doesn't repeat it
+        write_rejects(REJECT_FILENAME, FILENAME, rejects)
+        if len(rejects) > 0:
+            print(f"{len(rejects)} invalid row(s) were skipped. "
+                  f"See {REJECT_FILENAME}.\n")
         return movies
     except FileNotFoundError as e:
         print(f"Could not find {FILENAME} file.")
@@ -23,14 +71,63 @@ def read_movies():
         exit_program()
 
 def write_movies(movies):
+    global row_numbers, file_rows
     try:
         with open(FILENAME, "w", newline="") as file:
             writer = csv.writer(file)
             writer.writerows(movies)
+            # never drop a row just because it couldn't be read
+            writer.writerows(rejected_rows)
+        row_numbers = list(range(len(movies)))
+        file_rows = len(movies) + len(rejected_rows)
     except Exception as e:
         print(type(e), e)
         exit_program()
 
+def append_row(row):
+    global file_rows
+    try:
+        with open(FILENAME, "a", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(row)
+        file_rows += 1
+    except Exception as e:
+        print(type(e), e)
+        exit_program()
+
+def save_added_movie(movie):
+    row_numbers.append(file_rows)
+    append_row(movie)
+
+def save_deleted_movie(movies, index):
+    # call after the movie at index has been removed from the movies list
+    row_number = row_numbers.pop(index)
+    append_row([TOMBSTONE, row_number])
+    garbage_rows = file_rows - len(movies) - len(rejected_rows)
+    if garbage_rows > file_rows * GARBAGE_RATIO:
+        write_movies(movies)
+
+def reload_changed_movies(movies, index):
+    # compare a hash of each row to find the rows that changed
+    # and update only those rows in the movie list and index
+    new_movies = read_movies()
+    old_hashes = [hash(tuple(movie)) for movie in movies]
+    new_hashes = [hash(tuple(movie)) for movie in new_movies]
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+
+    changes = 0
+    # go backwards so the positions of earlier rows don't shift
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        for movie in movies[i1:i2]:
+            index.remove(movie)
+        for movie in new_movies[j1:j2]:
+            index.add(movie)
+        movies[i1:i2] = new_movies[j1:j2]
+        changes += max(i2 - i1, j2 - j1)
+    return changes
+
 def list_movies(movies):
     for i, movie in enumerate(movies, start=1):
         print(f"{i}. {movie[0]} ({movie[1]})")
@@ -39,10 +136,15 @@ def list_movies(movies):
 def add_movie(movies):
     name = input("Name: ")
     year = input("Year: ")
-    movie = [name, year]
+    try:
+        movie = MOVIE_SCHEMA.decode_row([name, year])
+    except RowError as e:
+        print(f"Invalid movie: {e}.\n")
+        return None
     movies.append(movie)
-    write_movies(movies)
+    save_added_movie(movie)
     print(f"{name} was added.\n")
+    return movie
 
 def delete_movie(movies):
     while True:
@@ -56,8 +158,30 @@ def delete_movie(movies):
         else:
             break
     movie = movies.pop(index - 1)
-    write_movies(movies)
+    save_deleted_movie(movies, index - 1)
     print(f"{movie[0]} was deleted.\n")
+    return movie
+
+def display_found_movies(found):
+    if len(found) == 0:
+        print("No movies were found.\n")
+    else:
+        for movie in found:
+            print(f"{movie[0]} ({movie[1]})")
+        print()
+
+def find_by_name(index):
+    prefix = input("Name starts with: ")
+    display_found_movies(index.find_by_name(prefix))
+
+def find_by_year(index):
+    try:
+        start_year = int(input("From year: "))
+        end_year = int(input("To year: "))
+    except ValueError:
+        print("Invalid year.\n")
+        return
+    display_found_movies(index.find_by_year(start_year, end_year))
 
 def display_menu():
     print("The Movie List program")
@@ -66,21 +190,41 @@ def display_menu():
     print("list - List all movies")
     print("add -  Add a movie")
     print("del -  Delete a movie")
+    print("name - Find movies by name")
+    print("year - Find movies by year")
     print("exit - Exit program")
     print()    
 
 def main():
     display_menu()
     movies = read_movies()
+    index = load_index(INDEX_FILENAME, FILENAME, movies)
+    stamp = get_file_stamp(FILENAME)
     while True:        
         command = input("Command: ")
+        if WATCH and get_file_stamp(FILENAME) != stamp:
+            changes = reload_changed_movies(movies, index)
+            stamp = get_file_stamp(FILENAME)
+            print(f"{FILENAME} was changed by another program. "
+                  f"{changes} movie(s) were reloaded.\n")
+
         if command.lower() == "list":
             list_movies(movies)
         elif command.lower() == "add":
-            add_movie(movies)
+            movie = add_movie(movies)
+            if movie:
+                index.add(movie)
+                stamp = get_file_stamp(FILENAME)
         elif command.lower() == "del":
-            delete_movie(movies)
+            movie = delete_movie(movies)
+            index.remove(movie)
+            stamp = get_file_stamp(FILENAME)
+        elif command.lower() == "name":
+            find_by_name(index)
+        elif command.lower() == "year":
+            find_by_year(index)
         elif command.lower() == "exit":
+            save_index(index, INDEX_FILENAME, FILENAME)
             break
         else:
             print("Not a valid command. Please try again.\n")
@@ -0,0 +1,186 @@
+import math
+import random
+from collections import Counter
+
+import wordlist
+
+# A headless hangman game, so the same rules can be played from the
+# keyboard or by a strategy in a simulation. The guessed letters are kept
+# in a set and in a 26-bit mask like the ones in wordlist, so checking a
+# guess or whether the game is won is a set lookup or one AND instead of a
+# search of the word.
+
+MAX_WRONG = 10
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# letters from most to least common in English text
+LETTER_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+class Game:
+    def __init__(self, word, max_wrong=MAX_WRONG):
+        self.word = word.upper()
+        self.max_wrong = max_wrong
+        self.word_mask = wordlist.get_letter_mask(self.word)
+        self.guessed_mask = 0
+        self.guessed = set()
+        self.guesses = []      # the guessed letters in order
+        self.num_wrong = 0
+
+    def has_guessed(self, letter):
+        return letter in self.guessed
+
+    def guess(self, letter):
+        # return the number of times the letter is in the word
+        letter = letter.upper()
+        if len(letter) != 1 or letter not in ALPHABET:
+            raise ValueError(f"{letter!r} is not a letter")
+        if letter in self.guessed:
+            raise ValueError(f"{letter} has already been guessed")
+        self.guessed.add(letter)
+        self.guesses.append(letter)
+        bit = wordlist.LETTER_BITS[letter.lower()]
+        self.guessed_mask |= bit
+        if self.word_mask & bit:
+            return self.word.count(letter)
+        self.num_wrong += 1
+        return 0
+
+    @property
+    def num_guesses(self):
+        return len(self.guesses)
+
+    @property
+    def guessed_letters(self):
+        return "".join(self.guesses)
+
+    @property
+    def wrong_letters(self):
+        return "".join(letter for letter in self.guesses if letter not in self.word)
+
+    @property
+    def displayed_word(self):
+        return "".join(char if char in self.guessed else "_" for char in self.word)
+
+    @property
+    def is_won(self):
+        return self.word_mask & ~self.guessed_mask == 0
+
+    @property
+    def is_lost(self):
+        return self.num_wrong >= self.max_wrong
+
+    @property
+    def is_over(self):
+        return self.is_won or self.is_lost
+
+# A strategy is told when a game starts and is then asked for one letter
+# at a time. It only looks at what a player could see: the displayed
+# word and the letters that have been guessed.
+
+class RandomStrategy:
+    def start(self, game):
+        pass
+
+    def choose(self, game):
+        return random.choice([letter for letter in ALPHABET
+                              if not game.has_guessed(letter)])
+
+class FrequencyStrategy:
+    # guess letters in order of how common they are in English
+    def start(self, game):
+        pass
+
+    def choose(self, game):
+        for letter in LETTER_ORDER:
+            if not game.has_guessed(letter):
+                return letter
+
+class CandidateStrategy:
+    # Keep the words from the word list that still fit the displayed word
+    # and guess the letter that's in the most of them. When no words fit,
+    # fall back to guessing letters in order of how common they are.
+    def __init__(self, word_list=None):
+        self.word_list = word_list or wordlist.word_list
+        self.words = {}           # word length -> the words of that length
+        self.first_choices = {}   # word length -> best first guess
+
+    def start(self, game):
+        length = len(game.displayed_word)
+        if length not in self.words:
+            self.words[length] = [group.get_word(index).upper()
+                                  for group in self.word_list.get_groups(length, length)
+                                  for index in range(len(group))]
+        self.candidates = self.words[length]
+        self.seen = 0   # number of guesses used to narrow the candidates
+
+    def update(self, game):
+        displayed_word = game.displayed_word
+        for letter in game.guesses[self.seen:]:
+            pattern = "".join(char if char == letter else "_" for char in displayed_word)
+            table = get_pattern_table(letter)
+            self.candidates = [word for word in self.candidates
+                               if word.translate(table) == pattern]
+        self.seen = game.num_guesses
+
+    def choose(self, game):
+        self.update(game)
+        if len(self.candidates) == 0:
+            return FrequencyStrategy().choose(game)
+        if game.num_guesses == 0:
+            # every game of the same length starts the same way
+            length = len(game.displayed_word)
+            if length not in self.first_choices:
+                self.first_choices[length] = self.best_letter(game)
+            return self.first_choices[length]
+        return self.best_letter(game)
+
+    def best_letter(self, game):
+        counts = Counter()
+        for word in self.candidates:
+            counts.update(set(word))
+        return max((letter for letter in ALPHABET if not game.has_guessed(letter)),
+                   key=lambda letter: (counts[letter], -LETTER_ORDER.index(letter)))
+
+class EntropyStrategy(CandidateStrategy):
+    # Guess the letter whose answer tells the most about the word: the
+    # one that splits the candidates into the most even groups by where
+    # the letter appears in them (or that it doesn't appear at all).
+    def best_letter(self, game):
+        present = set()
+        for word in self.candidates:
+            present.update(word)
+        best_letter = None
+        best_entropy = -1.0
+        total = len(self.candidates)
+        for letter in ALPHABET:
+            if game.has_guessed(letter) or letter not in present:
+                continue
+            table = get_pattern_table(letter)
+            groups = Counter(word.translate(table) for word in self.candidates)
+            entropy = -sum(count / total * math.log2(count / total)
+                           for count in groups.values())
+            if entropy > best_entropy:
+                best_letter, best_entropy = letter, entropy
+        return best_letter or FrequencyStrategy().choose(game)
+
+pattern_tables = {}
+
+def get_pattern_table(letter):
+    # a str.translate table that turns every letter except this one into "_"
+    if letter not in pattern_tables:
+        pattern_tables[letter] = str.maketrans({other: "_" for other in ALPHABET
+                                                if other != letter})
+    return pattern_tables[letter]
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "frequency": FrequencyStrategy,
+    "candidates": CandidateStrategy,
+    "entropy": EntropyStrategy,
+}
+
+def play(game, strategy):
+    strategy.start(game)
+    while not game.is_over:
+        game.guess(strategy.choose(game))
+    return game
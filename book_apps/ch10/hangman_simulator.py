@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import hangman_engine
+import wordlist
+from hangman_engine import MAX_WRONG, Game, play
+from hangman_solver import SolverStrategy
+
+# Plays many games of hangman with each strategy and ranks the strategies
+# by how many games they win. The games are split into batches that are
+# played at the same time in one process per CPU core. Each batch picks
+# its own random words from a seed, so only a few numbers are sent
+# between processes.
+
+BATCH_SIZE = 1000
+
+STRATEGIES = dict(hangman_engine.STRATEGIES, solver=SolverStrategy)
+
+def play_batch(strategy_name, games, seed, max_wrong=MAX_WRONG):
+    # return (wins, wrong guesses, guesses) for a batch of games
+    random.seed(seed)
+    strategy = STRATEGIES[strategy_name]()
+    wins = 0
+    total_wrong = 0
+    total_guesses = 0
+    for i in range(games):
+        game = play(Game(wordlist.get_random_word(), max_wrong), strategy)
+        if game.is_won:
+            wins += 1
+        total_wrong += game.num_wrong
+        total_guesses += game.num_guesses
+    return wins, total_wrong, total_guesses
+
+def simulate(strategy_name, games, processes=None, max_wrong=MAX_WRONG):
+    batches = []
+    for start in range(0, games, BATCH_SIZE):
+        batches.append(min(BATCH_SIZE, games - start))
+    wins = total_wrong = total_guesses = 0
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+        futures = [executor.submit(play_batch, strategy_name, size, seed, max_wrong)
+                   for seed, size in enumerate(batches)]
+        for future in futures:
+            batch_wins, batch_wrong, batch_guesses = future.result()
+            wins += batch_wins
+            total_wrong += batch_wrong
+            total_guesses += batch_guesses
+    return wins, total_wrong, total_guesses
+
+def main():
+    # python hangman_simulator.py [games] [strategy...]
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    names = sys.argv[2:] or list(STRATEGIES)
+
+    results = []
+    for name in names:
+        start = time.perf_counter()
+        wins, total_wrong, total_guesses = simulate(name, games)
+        elapsed = time.perf_counter() - start
+        results.append((wins / games, name, total_wrong / games,
+                        total_guesses / games, games / elapsed))
+
+    print(f"{games:,} games per strategy, {os.cpu_count()} process(es)")
+    print(f"{'Strategy':12}{'Won':>8}{'Wrong':>8}{'Guesses':>9}{'Games/s':>10}")
+    for win_rate, name, wrong, guesses, rate in sorted(results, reverse=True):
+        print(f"{name:12}{win_rate:>8.1%}{wrong:>8.2f}{guesses:>9.2f}{rate:>10,.0f}")
+
+if __name__ == "__main__":
+    main()
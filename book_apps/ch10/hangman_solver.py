@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+import math
+import time
+
+import wordlist
+from hangman_engine import FrequencyStrategy
+
+# Finds the words that fit a hangman pattern like "_ A _ _ E" and the
+# letter that best splits them. For each word length, the words are
+# indexed by letter and by the positions that letter is in, where the
+# positions are a bitmask (so "EAGLE" has E at positions 0b10001 and A at
+# 0b00010, and has no B, which is positions 0). Each entry in the index
+# is a set of words stored as the bits of one Python int, so the words
+# that fit every guess are found by ANDing a few ints together and counted
+# with int.bit_count(), without looking at the words one at a time.
+
+UNKNOWN = "_."   # characters that stand for a letter that isn't shown yet
+
+# when no more than this many words fit, they're split by exactly where
+# a letter is in them instead of only by whether it's in them
+EXACT_LIMIT = 128
+
+def parse_pattern(pattern):
+    # return the word length and {letter: positions} for the shown letters
+    chars = [char for char in pattern.lower() if not char.isspace()]
+    shown = {}
+    for position, char in enumerate(chars):
+        if char in UNKNOWN:
+            continue
+        if char not in wordlist.LETTER_BITS:
+            raise ValueError(f"{char!r} is not a letter or one of {UNKNOWN!r}")
+        shown[char] = shown.get(char, 0) | (1 << position)
+    return len(chars), shown
+
+def iter_bits(bits):
+    # yield the number of each bit that's set, lowest first, by searching
+    # the binary digits as a string (faster than shifting a big int)
+    digits = bin(bits)
+    end = len(digits)
+    while True:
+        end = digits.rfind("1", 2, end)
+        if end == -1:
+            break
+        yield len(digits) - 1 - end
+
+class PatternIndex:
+    # the index for the words of one length
+    def __init__(self, group):
+        self.group = group
+        self.all_words = (1 << len(group)) - 1
+        word_lists = {letter: {} for letter in wordlist.LETTER_BITS}
+        for index in range(len(group)):
+            positions = {}
+            for position, letter in enumerate(group.get_word(index)):
+                positions[letter] = positions.get(letter, 0) | (1 << position)
+            for letter, entries in word_lists.items():
+                entries.setdefault(positions.get(letter, 0), []).append(index)
+
+        # turn each list of word numbers into an int with those bits set
+        self.entries = {}
+        size = len(group) // 8 + 1
+        for letter, entries in word_lists.items():
+            self.entries[letter] = {}
+            for positions, indexes in entries.items():
+                data = bytearray(size)
+                for index in indexes:
+                    data[index >> 3] |= 1 << (index & 7)
+                self.entries[letter][positions] = int.from_bytes(data, "little")
+
+    def find(self, shown, wrong_letters):
+        # return the words that have every shown letter in exactly
+        # the positions it's shown in and none of the wrong letters
+        words = self.all_words
+        for letter, positions in shown.items():
+            words &= self.entries[letter].get(positions, 0)
+        for letter in wrong_letters:
+            words &= self.entries[letter].get(0, 0)
+        return words
+
+    def get_words(self, words, limit=None):
+        found = []
+        for index in iter_bits(words):
+            if limit is not None and len(found) >= limit:
+                break
+            found.append(self.group.get_word(index))
+        return found
+
+    def get_splits(self, words, guessed):
+        # Return {letter: sizes of the groups the words split into} for
+        # the letters that haven't been guessed, with the number of words
+        # that don't have the letter last. When there are only a few
+        # words, they're split by exactly where each letter is. Otherwise,
+        # they're only split by whether the letter is in them, which takes
+        # one AND for each letter instead of one for every entry.
+        total = words.bit_count()
+        if total <= EXACT_LIMIT:
+            groups = {}
+            for word in self.get_words(words):
+                positions = {}
+                for position, letter in enumerate(word):
+                    positions[letter] = positions.get(letter, 0) | (1 << position)
+                for letter, letter_positions in positions.items():
+                    sizes = groups.setdefault(letter, {})
+                    sizes[letter_positions] = sizes.get(letter_positions, 0) + 1
+            splits = {}
+            for letter, sizes in groups.items():
+                if letter not in guessed:
+                    missing = total - sum(sizes.values())
+                    splits[letter] = list(sizes.values()) + [missing]
+            return splits
+
+        splits = {}
+        for letter, entries in self.entries.items():
+            if letter not in guessed:
+                missing = (words & entries.get(0, 0)).bit_count()
+                splits[letter] = [total - missing, missing]
+        return splits
+
+    def best_letter(self, words, guessed):
+        # Return the letter whose answer splits the words into the most
+        # even groups, which is the one with the highest entropy. A letter
+        # that's in all of the words at the same places, or in none of
+        # them, tells nothing, so it's only returned if it's in all of them.
+        total = words.bit_count()
+        best, best_entropy = None, 0.0
+        sure = None   # a letter that's in every word
+        for letter, sizes in self.get_splits(words, guessed).items():
+            if sizes[-1] == 0 and sure is None:
+                sure = letter
+            sizes = [size for size in sizes if size > 0]
+            entropy = -sum(size / total * math.log2(size / total) for size in sizes)
+            if entropy > best_entropy:
+                best, best_entropy = letter, entropy
+        return best or sure
+
+class Solver:
+    def __init__(self, word_list=None):
+        self.word_list = word_list or wordlist.word_list
+        self.indexes = {}   # word length -> PatternIndex, built when first needed
+
+    def get_index(self, length):
+        if length not in self.indexes:
+            groups = self.word_list.get_groups(length, length)
+            self.indexes[length] = PatternIndex(groups[0] if groups
+                                                else wordlist.WordGroup(length, []))
+        return self.indexes[length]
+
+    def solve(self, pattern, wrong_letters=""):
+        # return (candidate count, a few candidates, recommended letter)
+        length, shown = parse_pattern(pattern)
+        wrong_letters = set(wrong_letters.lower()) & wordlist.LETTER_BITS.keys()
+        index = self.get_index(length)
+        words = index.find(shown, wrong_letters)
+        letter = index.best_letter(words, shown.keys() | wrong_letters)
+        return (words.bit_count(), index.get_words(words, 10),
+                letter.upper() if letter else None)
+
+class SolverStrategy:
+    # a hangman_engine strategy that asks the solver for each letter
+    def __init__(self, word_list=None):
+        self.solver = Solver(word_list)
+
+    def start(self, game):
+        pass
+
+    def choose(self, game):
+        count, words, letter = self.solver.solve(game.displayed_word, game.wrong_letters)
+        if letter is None:
+            # the word isn't in the word list
+            return FrequencyStrategy().choose(game)
+        return letter
+
+def main():
+    print("The Hangman Solver")
+    print("Enter the word as shown, like _ A _ _ E, and the wrong letters.")
+    print()
+    solver = Solver()
+    while True:
+        pattern = input("Word (or blank to quit): ").strip()
+        if pattern == "":
+            break
+        wrong_letters = input("Wrong letters: ").strip()
+        try:
+            start = time.perf_counter()
+            count, words, letter = solver.solve(pattern, wrong_letters)
+            elapsed = time.perf_counter() - start
+        except ValueError as e:
+            print(e)
+            continue
+        print(f"{count} word(s) fit: {', '.join(words)}{' ...' if count > len(words) else ''}")
+        if letter:
+            print(f"Try: {letter}")
+        print(f"({elapsed * 1000:.2f} ms)")
+        print()
+    print("Bye!")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,87 @@
+from array import array
+from collections import OrderedDict
+
 # a file in the current directory
 FILENAME = "movies.txt"
+CACHE_SIZE = 1000   # most movies kept in memory at once
+
+class MovieList:
+    """A movie list that reads each movie from the file only when it's used.
+
+    Opening the list records where each line starts, and the most recently
+    used movies are kept in a cache that never holds more than CACHE_SIZE.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.cache = OrderedDict()   # line index -> movie, oldest first
+        self.build_index()
+
+    def build_index(self):
+        self.offsets = array("q")
+        self.cache.clear()
+        with open(self.filename, "rb") as file:
+            offset = 0
+            for line in file:
+                self.offsets.append(offset)
+                offset += len(line)
+        self.end = offset
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.offsets)
+        if index in self.cache:
+            self.cache.move_to_end(index)
+            return self.cache[index]
+
+        with open(self.filename, "rb") as file:
+            file.seek(self.offsets[index])
+            line = file.readline().decode("utf-8")
+        movie = line.rstrip("\r\n").split("|")
+
+        self.cache[index] = movie
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return movie
+
+    def __iter__(self):
+        # read the lines in order with one open file instead of
+        # seeking to each one, and leave the cache alone
+        with open(self.filename, "rb") as file:
+            for index in range(len(self.offsets)):
+                line = file.readline().decode("utf-8")
+                yield line.rstrip("\r\n").split("|")
+
+    def append(self, movie):
+        line = ("|".join(movie) + "\n").encode("utf-8")
+        with open(self.filename, "ab") as file:
+            file.write(line)
+        self.offsets.append(self.end)
+        self.end += len(line)
+
+    def pop(self, index):
+        if index < 0:
+            index += len(self.offsets)
+        if index < 0 or index >= len(self.offsets):
+            raise IndexError("pop index out of range")
+        movie = self[index]
+        movies = [m for i, m in enumerate(self) if i != index]
+        write_movies(movies, self.filename)
+        self.build_index()
+        return movie
 
-def write_movies(movies):
-    with open(FILENAME, "w") as file:
+def write_movies(movies, filename=FILENAME):
+    # same encoding that MovieList reads and appends with
+    with open(filename, "w", encoding="utf-8") as file:
         for movie in movies:
             line = "|".join(movie)
             file.write(f"{line}\n")
 
 def read_movies():
-    movies = []
-    with open(FILENAME) as file:
-        for line in file:
-            line = line.replace("\n", "")
-            movie = line.split("|")
-            movies.append(movie)
-        return movies
+    return MovieList(FILENAME)
 
 def list_movies(movies):
     for i, movie in enumerate(movies, start=1):
@@ -28,13 +95,11 @@ def add_movie(movies):
     movie.append(name)
     movie.append(year)
     movies.append(movie)
-    write_movies(movies)
     print(f"{name} was added.\n")
 
 def delete_movie(movies):
     index = int(input("Number: "))   
     movie = movies.pop(index - 1)
-    write_movies(movies)
     print(f"{movie[0]} was deleted.\n")
         
 def display_menu():
@@ -0,0 +1,62 @@
+import re
+
+# Splits text into words and sentences with regular expressions that
+# know about Unicode letters, so any punctuation or whitespace (including
+# dashes, quotes, semicolons, and repeated spaces) separates words.
+
+# characters that are kept when they're inside a word, as in
+# "don't" or "well-known", but not at the start or end of a word
+INNER_PUNCTUATION = "'’-"
+
+SENTENCE_PATTERN = re.compile(r"""(?<=[.!?])\s+|(?<=[.!?]["'”’)])\s+""")
+
+def compile_word_pattern(inner_punctuation=INNER_PUNCTUATION):
+    # [^\W_] is a letter or digit in any language
+    if inner_punctuation == "":
+        return re.compile(r"[^\W_]+")
+    inner = re.escape(inner_punctuation)
+    return re.compile(rf"[^\W_]+(?:[{inner}][^\W_]+)*")
+
+WORD_PATTERN = compile_word_pattern()
+
+def get_words(text, pattern=WORD_PATTERN, case_fold=True):
+    if case_fold:
+        text = text.casefold()
+    return pattern.findall(text)
+
+def iter_words(chunks, pattern=WORD_PATTERN, case_fold=True,
+               inner_punctuation=INNER_PUNCTUATION):
+    # Yield the words in an iterable of text chunks, such as blocks read
+    # from a file. A word at the end of a chunk may go on in the next
+    # chunk, so the text after the last character that can't be part of
+    # a word is held back and joined to the next chunk. Only that last
+    # word is held back, however little whitespace the text has.
+    # inner_punctuation should match the one the pattern was compiled with.
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        end = len(text)
+        while end > 0 and (text[end - 1].isalnum() or text[end - 1] in inner_punctuation):
+            end -= 1
+        carry = text[end:]
+        for word in get_words(text[:end], pattern, case_fold):
+            yield word
+    for word in get_words(carry, pattern, case_fold):
+        yield word
+
+def iter_file_chunks(file, chunk_size):
+    while True:
+        chunk = file.read(chunk_size)
+        if chunk == "":
+            break
+        yield chunk
+
+def split_sentences(text):
+    # split after ., !, or ? (and any closing quotes) that's followed
+    # by whitespace, and drop empty sentences
+    sentences = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        sentence = " ".join(sentence.split())
+        if sentence != "":
+            sentences.append(sentence)
+    return sentences
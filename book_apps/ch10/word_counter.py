@@ -1,29 +1,36 @@
 #!/usr/bin/env python3
 
-def get_words_from_file(filename):
+from tokenizer import iter_file_chunks, iter_words
+
+CHUNK_SIZE = 64 * 1024   # characters read at a time
+
+def iter_words_from_file(filename, chunk_size=CHUNK_SIZE):
+    # read the file one chunk at a time, so memory use doesn't
+    # grow with the size of the file
     with open(filename) as file:
-        text = file.read()    # read str from file
-
-    # print(text)
-    text = text.replace("\n", "")
-    text = text.replace(",", "")
-    text = text.replace(".", "")
-    text = text.lower()
-    
-    words = text.split(" ")   # convert str to list
+        for word in iter_words(iter_file_chunks(file, chunk_size)):
+            yield word
+
+def get_words_from_file(filename):
+    words = list(iter_words_from_file(filename))   # get list of words
     words.sort()
-    # print(words)
     return words
 
+def count_sorted_words(words):
+    # words is sorted, so all copies of a word are next to each other
+    # and every count can be found in one pass through the list
+    word_counts = []
+    for word in words:
+        if len(word_counts) > 0 and word_counts[-1][0] == word:
+            word_counts[-1][1] += 1
+        else:
+            word_counts.append([word, 1])
+    return word_counts
+
 def get_unique_words(words):
     unique_words = []
-    unique_words.append(words[0])
-    
-    for i in range(1, len(words)):
-        if words[i] == words[i - 1]:
-            continue
-        else:
-            unique_words.append(words[i])            
+    for word, count in count_sorted_words(words):
+        unique_words.append(word)
     return unique_words
 
 def main():
@@ -32,16 +39,16 @@ def main():
 
     # get words and unique words
     words = get_words_from_file(filename) # get list of words
-    unique_words = get_unique_words(words)
+    word_counts = count_sorted_words(words)
 
     # display number of words and unique words   
     print(f"Number of words = {len(words)}")
-    print(f"Number of unique words = {len(unique_words)}")
+    print(f"Number of unique words = {len(word_counts)}")
 
     # display unique words and their word counts
     print("Unique word occurrences:")
-    for word in unique_words:
-        print(f"    {word} = {words.count(word)}")
+    for word, count in word_counts:
+        print(f"    {word} = {count}")
  
 if __name__ == "__main__":
     main()
@@ -0,0 +1,57 @@
+import os, random, sys, tempfile, time
+
+from word_counter import count_sorted_words, get_words_from_file
+
+# times word counting on a generated corpus:
+#   python word_counter_benchmark.py [size in MB]
+# The old words.count() method is timed on a small sample only,
+# because it takes minutes on a novel-sized input.
+
+CORPUS_MB = 100
+SAMPLE_MB = 0.2
+VOCABULARY_SIZE = 20000
+
+def make_corpus(filename, size_mb):
+    random.seed(1)
+    vocabulary = [f"word{i}" for i in range(VOCABULARY_SIZE)]
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    with open(filename, "w") as file:
+        while written < target:
+            line = " ".join(random.choices(vocabulary, k=1000)) + ". "
+            file.write(line)
+            written += len(line)
+
+def count_with_count_method(words):
+    unique_words = sorted(set(words))
+    return [[word, words.count(word)] for word in unique_words]
+
+def time_counting(filename, count_function):
+    start = time.perf_counter()
+    words = get_words_from_file(filename)
+    word_counts = count_function(words)
+    return time.perf_counter() - start, word_counts
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_MB
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sample = os.path.join(temp_dir, "sample.txt")
+        make_corpus(sample, SAMPLE_MB)
+        old_time, old_counts = time_counting(sample, count_with_count_method)
+        new_time, new_counts = time_counting(sample, count_sorted_words)
+        print(f"{SAMPLE_MB} MB sample:")
+        print(f"    words.count() per word:  {old_time:8.2f} sec")
+        print(f"    sorted run lengths:      {new_time:8.2f} sec")
+        print(f"    same counts: {old_counts == new_counts}")
+        print()
+
+        corpus = os.path.join(temp_dir, "corpus.txt")
+        make_corpus(corpus, size_mb)
+        new_time, new_counts = time_counting(corpus, count_sorted_words)
+        print(f"{size_mb} MB corpus:")
+        print(f"    sorted run lengths:      {new_time:8.2f} sec "
+              f"({len(new_counts):,} unique words)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+import locale
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+from tokenizer import get_words
+
+# A persistent inverted index for the text files in a directory. For
+# each word it stores the files and lines the word appears on, and the
+# byte offset of each line, so a query can read the matching lines
+# directly instead of scanning the files again. Reindexing only reads
+# files that were added or changed since the last time.
+
+DB_FILE = "text_index.sqlite"
+ENCODING = locale.getpreferredencoding(False)
+
+conn = None
+
+def connect():
+    global conn
+    if not conn:
+        conn = sqlite3.connect(DB_FILE)
+        conn.row_factory = sqlite3.Row
+        create_tables()
+
+def close():
+    global conn
+    if conn:
+        conn.close()
+        conn = None
+
+def create_tables():
+    script = '''CREATE TABLE IF NOT EXISTS File (
+                    fileID INTEGER PRIMARY KEY,
+                    path   TEXT NOT NULL UNIQUE,
+                    size   INTEGER NOT NULL,
+                    mtime  INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS Posting (
+                    word       TEXT NOT NULL,
+                    fileID     INTEGER NOT NULL,
+                    lineNumber INTEGER NOT NULL,
+                    offset     INTEGER NOT NULL,
+                    PRIMARY KEY (word, fileID, lineNumber)) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS PostingFile ON Posting (fileID);'''
+    with closing(conn.cursor()) as c:
+        c.executescript(script)
+
+def iter_lines(path):
+    # yield the line number, byte offset, and text of each line
+    offset = 0
+    with open(path, "rb") as file:
+        for line_number, line in enumerate(file, start=1):
+            yield line_number, offset, line.decode(ENCODING, errors="replace")
+            offset += len(line)
+
+def index_file(c, file_id, path):
+    postings = []
+    for line_number, offset, line in iter_lines(path):
+        for word in set(get_words(line)):
+            postings.append((word, file_id, line_number, offset))
+    c.executemany('''INSERT INTO Posting (word, fileID, lineNumber, offset)
+                     VALUES (?, ?, ?, ?)''', postings)
+
+def get_file_stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def update_file(c, file_id, path):
+    # reindex a file that changed, or remove it from the index if it's gone
+    c.execute("DELETE FROM Posting WHERE fileID = ?", (file_id,))
+    try:
+        size, mtime = get_file_stamp(path)
+    except FileNotFoundError:
+        c.execute("DELETE FROM File WHERE fileID = ?", (file_id,))
+        return
+    c.execute("UPDATE File SET size = ?, mtime = ? WHERE fileID = ?",
+              (size, mtime, file_id))
+    index_file(c, file_id, path)
+
+def index_directory(directory, extension=".txt"):
+    # add new and changed files to the index and remove deleted ones
+    connect()
+    directory = os.path.abspath(directory)
+    paths = {}
+    for root, dirs, files in os.walk(directory):
+        for filename in files:
+            if filename.endswith(extension):
+                path = os.path.join(root, filename)
+                paths[path] = get_file_stamp(path)
+
+    indexed = 0
+    with conn:
+        with closing(conn.cursor()) as c:
+            c.execute("SELECT fileID, path, size, mtime FROM File")
+            known = {row["path"]: row for row in c.fetchall()}
+
+            for path, row in known.items():
+                # compare whole directory names, so indexing a/b
+                # doesn't remove the files in a/bc
+                in_directory = os.path.commonpath([path, directory]) == directory
+                if in_directory and path not in paths:
+                    c.execute("DELETE FROM Posting WHERE fileID = ?", (row["fileID"],))
+                    c.execute("DELETE FROM File WHERE fileID = ?", (row["fileID"],))
+
+            for path, (size, mtime) in paths.items():
+                row = known.get(path)
+                if row and row["size"] == size and row["mtime"] == mtime:
+                    continue   # unchanged since it was last indexed
+                if row:
+                    update_file(c, row["fileID"], path)
+                else:
+                    c.execute("INSERT INTO File (path, size, mtime) VALUES (?, ?, ?)",
+                              (path, size, mtime))
+                    index_file(c, c.lastrowid, path)
+                indexed += 1
+    return indexed
+
+def query_lines(words):
+    placeholders = ", ".join("?" * len(words))
+    query = f'''SELECT File.fileID, path, size, mtime, lineNumber, offset
+                FROM Posting JOIN File ON Posting.fileID = File.fileID
+                WHERE word IN ({placeholders})
+                GROUP BY Posting.fileID, lineNumber
+                HAVING COUNT(*) = ?
+                ORDER BY path, lineNumber'''
+    with closing(conn.cursor()) as c:
+        c.execute(query, words + [len(words)])
+        return c.fetchall()
+
+def find_lines(text):
+    # return (path, line number, line) for each line that has every word
+    connect()
+    words = sorted(set(get_words(text)))
+    if len(words) == 0:
+        return []
+    results = query_lines(words)
+
+    # the stored offsets are only right for the file as it was indexed,
+    # so reindex any file that has changed since then and query again
+    changed = {}
+    for row in results:
+        try:
+            stamp = get_file_stamp(row["path"])
+        except FileNotFoundError:
+            stamp = None
+        if stamp != (row["size"], row["mtime"]):
+            changed[row["fileID"]] = row["path"]
+    if changed:
+        with conn:
+            with closing(conn.cursor()) as c:
+                for file_id, path in changed.items():
+                    update_file(c, file_id, path)
+        results = query_lines(words)
+
+    lines = []
+    for row in results:
+        with open(row["path"], "rb") as file:
+            file.seek(row["offset"])
+            line = file.readline().decode(ENCODING, errors="replace")
+        lines.append((row["path"], row["lineNumber"], line.rstrip("\r\n")))
+    return lines
+
+def main():
+    # python text_index.py index [directory]
+    # python text_index.py query word...
+    if len(sys.argv) < 2 or sys.argv[1] not in ("index", "query"):
+        print("Usage: text_index.py index [directory] | query word...")
+        return
+
+    start = time.perf_counter()
+    if sys.argv[1] == "index":
+        directory = sys.argv[2] if len(sys.argv) > 2 else "."
+        count = index_directory(directory)
+        print(f"{count} file(s) indexed.")
+    else:
+        lines = find_lines(" ".join(sys.argv[2:]))
+        for path, line_number, line in lines:
+            print(f"{os.path.basename(path)}:{line_number}: {line}")
+        print(f"{len(lines)} matching line(s).")
+    elapsed = time.perf_counter() - start
+    print(f"({elapsed * 1000:.1f} ms)")
+    close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import random, time
+
+from tokenizer import compile_word_pattern, get_words, split_sentences
+
+# compares the throughput of the regular expression tokenizer with the
+# replace() chain and split(" ") that the word counters used before
+
+TEXT_MB = 20
+
+def make_text(size_mb):
+    random.seed(1)
+    pieces = ["nation", "Liberty", "can't", "war-torn", "dedicated—we",
+              "people;", "earth.", "  ", "“quoted”", "Ärger", "here,\n"]
+    words = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        word = random.choice(pieces)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+def replace_chain(text):
+    text = text.replace("\n", "")
+    text = text.replace(",", "")
+    text = text.replace(".", "")
+    text = text.lower()
+    return text.split(" ")
+
+def timed(label, function, text):
+    start = time.perf_counter()
+    result = function(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:32} {TEXT_MB / elapsed:8.1f} MB/sec  {len(result):>10,} items")
+
+def main():
+    text = make_text(TEXT_MB)
+    print(f"{TEXT_MB} MB of text")
+    print()
+    timed("replace chain and split(' ')", replace_chain, text)
+    timed("regex words, case folded", get_words, text)
+    no_inner = compile_word_pattern("")
+    timed("regex words, no inner marks", lambda text: get_words(text, no_inner), text)
+    timed("split('.') sentences", lambda text: text.split("."), text)
+    timed("regex sentences", split_sentences, text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import socket
+import struct
+import sys
+import zlib
+from array import array
+
+from word_counter import count_words, iter_words_from_file
+
+# A WordCount holds the result of counting the words in one or more
+# files, so it can be saved and combined with counts made at other times
+# or on other machines without reading the text again. Merging adds the
+# counts together, so it doesn't matter how the counts are grouped or in
+# which order they're merged. Each source is named by the computer and
+# full path it was counted from, and counts that share a source can't be
+# merged, so the same text is never counted twice.
+#
+# A count is saved as JSON if the filename ends with .json. Otherwise
+# it's saved in a compact binary form: a header, then the words
+# (separated by null bytes) and an array of 64-bit counts, compressed
+# together with zlib.
+
+MAGIC = b"WCOUNT1\n"
+HEADER = struct.Struct("<QQ")   # number of words, length of the word data
+
+class WordCount:
+    def __init__(self, counts=None, sources=None):
+        self.counts = dict(counts) if counts else {}
+        self.sources = sorted(sources) if sources else []
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def merge(self, other):
+        # return a new WordCount with the counts of both added together
+        shared = set(self.sources) & set(other.sources)
+        if shared:
+            raise ValueError(f"already counted: {', '.join(sorted(shared))}")
+        counts = dict(self.counts)
+        for word, count in other.counts.items():
+            counts[word] = counts.get(word, 0) + count
+        return WordCount(counts, self.sources + other.sources)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def __eq__(self, other):
+        return (isinstance(other, WordCount) and self.counts == other.counts
+                and self.sources == other.sources)
+
+    def diff(self, other):
+        # return {word: change} for each word whose count is different in other
+        changes = {}
+        for word in self.counts.keys() | other.counts.keys():
+            change = other.counts.get(word, 0) - self.counts.get(word, 0)
+            if change != 0:
+                changes[word] = change
+        return changes
+
+    def to_json(self):
+        return json.dumps({"sources": self.sources, "counts": self.counts},
+                          ensure_ascii=False, sort_keys=True)
+
+    @staticmethod
+    def from_json(text):
+        data = json.loads(text)
+        return WordCount(data["counts"], data["sources"])
+
+    def to_bytes(self):
+        words = sorted(self.counts)
+        word_data = b"\0".join(word.encode("utf-8") for word in words)
+        counts = array("Q", (self.counts[word] for word in words))
+        if sys.byteorder != "little":
+            counts.byteswap()
+        source_data = json.dumps(self.sources).encode("utf-8")
+        body = (HEADER.pack(len(words), len(word_data)) + word_data +
+                counts.tobytes() + source_data)
+        return MAGIC + zlib.compress(body)
+
+    @staticmethod
+    def from_bytes(data):
+        if not data.startswith(MAGIC):
+            raise ValueError("not a word count file")
+        body = zlib.decompress(data[len(MAGIC):])
+        word_total, word_length = HEADER.unpack_from(body)
+        start = HEADER.size
+        word_data = body[start:start + word_length]
+        words = word_data.decode("utf-8").split("\0") if word_total else []
+        start += word_length
+        counts = array("Q")
+        counts.frombytes(body[start:start + word_total * counts.itemsize])
+        if sys.byteorder != "little":
+            counts.byteswap()
+        start += word_total * counts.itemsize
+        sources = json.loads(body[start:].decode("utf-8"))
+        return WordCount(zip(words, counts), sources)
+
+def get_source(filename):
+    return f"{socket.gethostname()}:{os.path.abspath(filename)}"
+
+def count_file(filename):
+    word_count = count_words(iter_words_from_file(filename))
+    return WordCount(word_count, [get_source(filename)])
+
+def save(word_count, filename):
+    # write to a temporary file first so a failed save can't
+    # leave a half-written count behind
+    if filename.endswith(".json"):
+        data = word_count.to_json().encode("utf-8")
+    else:
+        data = word_count.to_bytes()
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "wb") as file:
+        file.write(data)
+    os.replace(temp_filename, filename)
+
+def load(filename):
+    with open(filename, "rb") as file:
+        data = file.read()
+    if filename.endswith(".json"):
+        return WordCount.from_json(data.decode("utf-8"))
+    return WordCount.from_bytes(data)
+
+def display_diff(changes):
+    for word in sorted(changes, key=lambda word: (-abs(changes[word]), word)):
+        print(f"{word} {changes[word]:+}")
+
+def main():
+    # python word_count_file.py count textfile countfile
+    # python word_count_file.py merge countfile countfile... outfile
+    # python word_count_file.py diff countfile countfile
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    args = sys.argv[2:]
+    if command == "count" and len(args) == 2:
+        word_count = count_file(args[0])
+        save(word_count, args[1])
+        print(f"{len(word_count.counts)} words, {word_count.total} in all.")
+    elif command == "merge" and len(args) >= 2:
+        word_count = WordCount()
+        try:
+            for filename in args[:-1]:
+                word_count = word_count.merge(load(filename))
+        except ValueError as e:
+            print(f"Can't merge {filename}: {e}")
+            return
+        save(word_count, args[-1])
+        print(f"{len(word_count.counts)} words, {word_count.total} in all, "
+              f"from {', '.join(word_count.sources)}.")
+    elif command == "diff" and len(args) == 2:
+        display_diff(load(args[0]).diff(load(args[1])))
+    else:
+        print("Usage: word_count_file.py count textfile countfile\n"
+              "       word_count_file.py merge countfile... outfile\n"
+              "       word_count_file.py diff countfile countfile")
+
+if __name__ == "__main__":
+    main()
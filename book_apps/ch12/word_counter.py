@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
-    
-def get_words_from_file(filename):
+
+import codecs
+import locale
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tokenizer import iter_file_chunks, iter_words
+
+CHUNK_SIZE = 64 * 1024   # characters read at a time
+
+def iter_words_from_file(filename, chunk_size=CHUNK_SIZE):
+    # read the file one chunk at a time, so memory use doesn't
+    # grow with the size of the file
     with open(filename) as file:
-        text = file.read()    # read str from file
+        for word in iter_words(iter_file_chunks(file, chunk_size)):
+            yield word
 
-    text = text.replace("\n", "")
-    text = text.replace(",", "")
-    text = text.replace(".", "")
-    text = text.lower()
-    
-    words = text.split(" ")   # convert str to list
+def get_words_from_file(filename):
+    words = list(iter_words_from_file(filename))   # get list of words
     return words
 
 def count_words(words):
@@ -22,6 +30,75 @@ def count_words(words):
             word_count[word] = 1   # add word with count of 1
     return word_count
 
+# Files at least this big are split into one part per CPU core and
+# the parts are counted at the same time in separate processes.
+PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+
+# bytes the parts can be split at (in UTF-8 and the usual 8-bit
+# encodings, these bytes are never part of another character)
+SEPARATORS = (b" ", b"\n", b"\t")
+
+def find_part_offsets(filename, parts):
+    # Return (start, end) byte offsets that split the file into parts.
+    # Each part ends just before a space, newline, or tab and the next
+    # part starts just after it, so no word is split and no empty word
+    # is added.
+    size = os.path.getsize(filename)
+    offsets = []
+    start = 0
+    with open(filename, "rb") as file:
+        for i in range(1, parts):
+            position = max(size * i // parts, start)
+            file.seek(position)
+            while True:
+                block = file.read(CHUNK_SIZE)
+                if block == b"":
+                    separator = size
+                    break
+                indexes = [index for index in map(block.find, SEPARATORS)
+                           if index != -1]
+                if indexes:
+                    separator = position + min(indexes)
+                    break
+                position += len(block)
+            if separator >= size:
+                break
+            offsets.append((start, separator))
+            start = separator + 1
+    offsets.append((start, size))
+    return offsets
+
+def iter_part_chunks(filename, start, end):
+    # yield the text between two byte offsets of the file
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))()
+    with open(filename, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(CHUNK_SIZE, remaining))
+            if block == b"":
+                break
+            remaining -= len(block)
+            yield decoder.decode(block, final=(remaining == 0))
+
+def count_words_in_part(filename, start, end):
+    # count the words between two byte offsets of the file
+    return count_words(iter_words(iter_part_chunks(filename, start, end)))
+
+def count_words_parallel(filename, processes=None):
+    # map: count each part in its own process
+    # reduce: add the counts for the parts together
+    parts = processes or os.cpu_count() or 1
+    offsets = find_part_offsets(filename, parts)
+    with ProcessPoolExecutor(max_workers=parts) as executor:
+        futures = [executor.submit(count_words_in_part, filename, start, end)
+                   for start, end in offsets]
+        word_count = {}
+        for future in futures:
+            for word, count in future.result().items():
+                word_count[word] = word_count.get(word, 0) + count
+    return word_count
+
 def display_word_count(word_count):
     words = list(word_count.keys())
     words.sort(key=str.lower)
@@ -37,8 +114,11 @@ def main():
     filename = "gettysburg_address.txt"
 
     # get words, count, and display
-    words = get_words_from_file(filename) # get list of words
-    word_count = count_words(words)       # create dict from list
+    if os.path.getsize(filename) >= PARALLEL_MIN_SIZE:
+        word_count = count_words_parallel(filename)
+    else:
+        words = iter_words_from_file(filename)  # read words one chunk at a time
+        word_count = count_words(words)         # create dict from words
     display_word_count(word_count)
     
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import heapq
+import sys
+from collections import deque
+
+from word_counter import count_words, iter_words_from_file
+
+# Frequency reports for the word counter: the top K words, word pairs
+# (bigrams) and triples (trigrams), plus two approximate counters that
+# use a fixed amount of memory however much text they're given.
+
+def top_k(word_count, k):
+    # return the k (word, count) pairs with the highest counts
+    return heapq.nlargest(k, word_count.items(), key=lambda item: item[1])
+
+def iter_ngrams(words, n):
+    # yield each run of n words in a row as a string like "of the people"
+    window = deque(maxlen=n)
+    for word in words:
+        window.append(word)
+        if len(window) == n:
+            yield " ".join(window)
+
+def count_ngrams(words, n):
+    return count_words(iter_ngrams(words, n))
+
+class SpaceSaving:
+    """Approximate top-K counter that never keeps more than `size` words.
+
+    When a new word arrives and the counter is full, it replaces the word
+    with the lowest count and starts from that count, so a count can be too
+    high by at most the error recorded for the word, but never too low.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.counts = {}
+        self.errors = {}
+        self.heap = []   # (count, word) entries, some of which are out of date
+
+    def add(self, word):
+        if word in self.counts:
+            self.counts[word] += 1
+        elif len(self.counts) < self.size:
+            self.counts[word] = 1
+            self.errors[word] = 0
+        else:
+            # find the word with the lowest count, skipping old heap entries
+            while True:
+                count, old_word = heapq.heappop(self.heap)
+                if self.counts.get(old_word) == count:
+                    break
+            del self.counts[old_word]
+            del self.errors[old_word]
+            self.counts[word] = count + 1
+            self.errors[word] = count
+        heapq.heappush(self.heap, (self.counts[word], word))
+        if len(self.heap) > 4 * self.size:
+            self.heap = [(count, word) for word, count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def add_all(self, words):
+        for word in words:
+            self.add(word)
+
+    def top_k(self, k):
+        return top_k(self.counts, k)
+
+class CountMinSketch:
+    """Approximate counts for any number of words in width * depth counters.
+
+    Each word is counted in one counter of each of `depth` rows, and its
+    estimate is the lowest of those counters. Estimates can be too high
+    when words share counters, but never too low.
+    """
+
+    def __init__(self, width=16384, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for i in range(depth)]
+
+    def add(self, word, count=1):
+        for i, row in enumerate(self.rows):
+            row[hash((i, word)) % self.width] += count
+
+    def add_all(self, words):
+        for word in words:
+            self.add(word)
+
+    def estimate(self, word):
+        return min(row[hash((i, word)) % self.width]
+                   for i, row in enumerate(self.rows))
+
+def display_top(title, pairs):
+    print(title)
+    for word, count in pairs:
+        print(f"    {word} = {count}")
+    print()
+
+def display_accuracy(word_count, k, space_saving, sketch):
+    exact = top_k(word_count, k)
+    exact_words = set(word for word, count in exact)
+    approximate_words = set(word for word, count in space_saving.top_k(k))
+    recall = len(exact_words & approximate_words) / max(len(exact_words), 1)
+
+    errors = []
+    for word, count in word_count.items():
+        errors.append((sketch.estimate(word) - count) / count)
+    top_errors = [(sketch.estimate(word) - count) / count for word, count in exact]
+
+    print("ACCURACY AGAINST EXACT COUNTS")
+    print(f"    Space-Saving ({space_saving.size} counters): "
+          f"{recall:.0%} of the exact top {k} found")
+    print(f"    Count-Min ({sketch.depth} x {sketch.width} counters): "
+          f"average error {sum(errors) / max(len(errors), 1):.1%} "
+          f"for all words, {sum(top_errors) / max(len(top_errors), 1):.1%} "
+          f"for the top {k}")
+    print()
+
+def main():
+    # python word_stats.py [filename] [k]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "gettysburg_address.txt"
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    if k < 1:
+        print("k must be at least 1.")
+        return
+
+    word_count = count_words(iter_words_from_file(filename))
+    display_top(f"TOP {k} WORDS", top_k(word_count, k))
+
+    bigram_count = count_ngrams(iter_words_from_file(filename), 2)
+    display_top(f"TOP {k} BIGRAMS", top_k(bigram_count, k))
+    trigram_count = count_ngrams(iter_words_from_file(filename), 3)
+    display_top(f"TOP {k} TRIGRAMS", top_k(trigram_count, k))
+
+    space_saving = SpaceSaving(10 * k)
+    space_saving.add_all(iter_words_from_file(filename))
+    sketch = CountMinSketch()
+    sketch.add_all(iter_words_from_file(filename))
+    display_top(f"TOP {k} WORDS (SPACE-SAVING)", space_saving.top_k(k))
+    display_accuracy(word_count, k, space_saving, sketch)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import csv
+import os
+
+# A Schema describes the columns of a CSV file. Each Field converts one
+# cell to its type and checks that the value is allowed. The schema turns
+# its fields into one list of (column, convert, check) steps when it's
+# created, so each row is converted and checked in a single pass.
+# Rows that fail are written to a reject log with their line numbers
+# instead of stopping the program. The log is rewritten each time the
+# file is read, so a bad row is only in the log once.
+
+class RowError(ValueError):
+    pass
+
+class Field:
+    def __init__(self, name, type=str, check=None, message="is not allowed"):
+        self.name = name
+        self.type = type        # function that converts the cell
+        self.check = check      # function that returns True if the value is OK
+        self.message = message  # shown when check returns False
+
+class Schema:
+    def __init__(self, *fields):
+        self.fields = fields
+        self.steps = tuple((i, field.name, field.type, field.check, field.message)
+                           for i, field in enumerate(fields))
+
+    def decode_row(self, row):
+        # return a list of converted values or raise a RowError
+        if len(row) != len(self.steps):
+            raise RowError(f"expected {len(self.steps)} columns, got {len(row)}")
+        values = []
+        for i, name, convert, check, message in self.steps:
+            try:
+                value = convert(row[i].strip())
+            except ValueError:
+                raise RowError(f"{name} {row[i]!r} is not a valid {convert.__name__}")
+            if check is not None and not check(value):
+                raise RowError(f"{name} {value!r} {message}")
+            values.append(value)
+        return values
+
+    def decode(self, rows, rejects=None):
+        # yield the converted rows and add (line number, error, row)
+        # to rejects for the ones that can't be converted
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                yield self.decode_row(row)
+            except RowError as e:
+                if rejects is not None:
+                    # a csv.reader knows the line number even when a
+                    # quoted cell runs over several lines
+                    line_number = getattr(rows, "line_num", row_number)
+                    rejects.append((line_number, e, row))
+
+    def read(self, filename, reject_filename=None, rejects=None):
+        if rejects is None:
+            rejects = []
+        with open(filename, newline="") as file:
+            reader = csv.reader(file)
+            values = list(self.decode(reader, rejects))
+        if reject_filename is not None:
+            write_rejects(reject_filename, os.path.basename(filename), rejects)
+        return values
+
+def write_rejects(reject_filename, source, rejects):
+    # replace the log with the rows rejected by the latest read
+    if len(rejects) == 0 and not os.path.exists(reject_filename):
+        return
+    with open(reject_filename, "w") as file:
+        for line_number, error, row in rejects:
+            file.write(f"{source} line {line_number}: {error}: {','.join(row)}\n")
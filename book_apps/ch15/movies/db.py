@@ -1,30 +1,87 @@
 from objects import DataAccessError
+from csv_schema import Field, Schema
 import csv
+import os
 
 FILENAME = "movies.csv"
+REJECT_FILENAME = "rejects.log"
+
+MOVIE_SCHEMA = Schema(
+    Field("name", str, lambda name: name != "", "is empty"),
+    Field("year", int, lambda year: 1800 <= year <= 2100, "is not a valid year"))
+
+# The new movies file is always fsynced before it's renamed over the old
+# one, so the file that ends up with the name is always complete. This
+# policy says when to fsync the directory, which makes the rename itself
+# durable (until then, a crash may bring back the previous movie list):
+#   "none"   - leave it to the operating system (fastest)
+#   "batch"  - every BATCH_SIZE writes and when sync() is called
+#   "always" - after every write (slowest, but nothing is ever lost)
+FSYNC_POLICY = "batch"
+BATCH_SIZE = 10
+
+unsynced_writes = 0
+rejected_rows = []   # rows that aren't valid movies, kept so they're written back
 
 def read_movies():
+    # rows that aren't valid movies are skipped and logged in REJECT_FILENAME
     try:
-        movies = []
-        with open(FILENAME, newline="") as file:
-            reader = csv.reader(file)
-            for row in reader:
-                movies.append(row)
+        rejects = []
+        movies = MOVIE_SCHEMA.read(FILENAME, REJECT_FILENAME, rejects)
+        rejected_rows[:] = [row for line_number, error, row in rejects]
         return movies
-    except FileNotFoundError:
-        raise DataAccessError("Data source not found.")
-    except Exception:
-        raise DataAccessError("Error accessing data source.")
+    except FileNotFoundError as e:
+        raise DataAccessError("Data source not found.") from e
+    except (OSError, csv.Error) as e:
+        raise DataAccessError(f"Error reading data source: {e}") from e
+
+def sync_directory():
+    # make the rename itself durable (not possible on Windows)
+    if os.name != "nt":
+        directory = os.open(os.path.dirname(os.path.abspath(FILENAME)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
 
 def write_movies(movies):
+    # write a temporary file, fsync it, and rename it over the old one,
+    # so a crash leaves either the old or the new movie list but never
+    # part of one
+    global unsynced_writes
+    temp_filename = FILENAME + ".tmp"
     try:
-        with open(FILENAME, "w", newline="") as file:
+        unsynced_writes += 1
+        sync_now = (FSYNC_POLICY == "always" or
+                    (FSYNC_POLICY == "batch" and unsynced_writes >= BATCH_SIZE))
+        with open(temp_filename, "w", newline="") as file:
             writer = csv.writer(file)
             writer.writerows(movies)
-    except Exception:
-        raise DataAccessError("Error accessing data source.")
+            # never drop a row just because it couldn't be read
+            writer.writerows(rejected_rows)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_filename, FILENAME)
+        if sync_now:
+            sync_directory()
+            unsynced_writes = 0
+    except OSError as e:
+        raise DataAccessError(f"Error writing data source: {e}") from e
+
+def sync():
+    # make any renames that the fsync policy hasn't synced yet durable
+    global unsynced_writes
+    if unsynced_writes == 0 or FSYNC_POLICY == "none":
+        return
+    try:
+        sync_directory()
+        unsynced_writes = 0
+    except OSError as e:
+        raise DataAccessError(f"Error writing data source: {e}") from e
 
 def add_movie(movies, movie):
+    # raises RowError if the movie is not valid
+    movie = MOVIE_SCHEMA.decode_row([str(value) for value in movie])
     movies.append(movie)
     write_movies(movies)
 
@@ -0,0 +1,35 @@
+import os, tempfile, time
+
+import db
+
+# measures how many times per second write_movies can save a movie list
+# with each fsync policy
+
+MOVIE_COUNT = 1000
+WRITES = 200
+
+def main():
+    movies = []
+    for i in range(MOVIE_COUNT):
+        movies.append([f"Movie number {i}", str(1900 + i % 120)])
+
+    print(f"{WRITES} writes of a {MOVIE_COUNT:,}-movie list")
+    print()
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(dir=original_dir) as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            for policy in ("none", "batch", "always"):
+                db.FSYNC_POLICY = policy
+                start = time.perf_counter()
+                for i in range(WRITES):
+                    db.write_movies(movies)
+                db.sync()
+                elapsed = time.perf_counter() - start
+                print(f"{policy:8} {WRITES / elapsed:10.1f} writes/sec")
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
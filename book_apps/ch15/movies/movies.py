@@ -1,4 +1,5 @@
 from objects import DataAccessError
+from csv_schema import RowError
 import db
 import sys
 
@@ -18,12 +19,13 @@ def display_movies(movies):
     print()
 
 def get_movie():
-    name = input("Name: ")
-    year = input("Year: ")
-    movie = []
-    movie.append(name)
-    movie.append(year)
-    return movie    
+    while True:
+        name = input("Name: ")
+        year = input("Year: ")
+        try:
+            return db.MOVIE_SCHEMA.decode_row([name, year])
+        except RowError as e:
+            print(f"Invalid movie: {e}. Please try again.")
         
 def get_movie_number(movies):
     while True:
@@ -62,6 +64,7 @@ def main():
             movie = db.delete_movie(movies, number-1)
             print(f"{movie[0]} was deleted.\n")
         elif command == "exit":
+            db.sync()
             break
         else:
             print("Not a valid command. Please try again.\n")
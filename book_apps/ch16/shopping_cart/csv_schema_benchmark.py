@@ -0,0 +1,37 @@
+import time
+
+from business import Product
+from db import PRODUCT_SCHEMA
+
+# compares the rows/sec of the schema decoder with the ad hoc
+# Product(row[0], float(row[1]), int(row[2])) parsing it replaced
+
+ROW_COUNT = 500000
+
+def ad_hoc(rows):
+    products = []
+    for row in rows:
+        products.append(Product(row[0], float(row[1]), int(row[2])))
+    return products
+
+def with_schema(rows):
+    products = []
+    for row in PRODUCT_SCHEMA.decode(rows):
+        products.append(Product(*row))
+    return products
+
+def main():
+    rows = []
+    for i in range(ROW_COUNT):
+        rows.append([f"Product {i}", f"{i % 100}.99", str(i % 50)])
+
+    print(f"{ROW_COUNT:,} rows")
+    for label, function in (("Ad hoc", ad_hoc), ("Schema", with_schema)):
+        start = time.perf_counter()
+        function(rows)
+        elapsed = time.perf_counter() - start
+        print(f"{label:8} {ROW_COUNT / elapsed:12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
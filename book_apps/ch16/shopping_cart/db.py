@@ -1,17 +1,23 @@
-import csv, os
+import os
 from business import Product
+from csv_schema import Field, Schema
 
 # FILENAME = "products.csv"
 
 BASE_DIR = os.path.dirname(__file__)
 FILENAME = os.path.join(BASE_DIR, "products.csv")
+REJECT_FILENAME = os.path.join(BASE_DIR, "rejects.log")
+
+PRODUCT_SCHEMA = Schema(
+    Field("name", str, lambda name: name != "", "is empty"),
+    Field("price", float, lambda price: price >= 0, "is negative"),
+    Field("discountPercent", int, lambda percent: 0 <= percent <= 100,
+          "is not between 0 and 100"))
 
 def get_products():
     products = []
-    with open(FILENAME, newline="") as file:
-        reader = csv.reader(file)
-        for row in reader:
-            # convert row to Product object
-            product = Product(row[0], float(row[1]), int(row[2])) 
-            products.append(product)
+    for row in PRODUCT_SCHEMA.read(FILENAME, REJECT_FILENAME):
+        # convert row to Product object
+        product = Product(*row)
+        products.append(product)
     return products
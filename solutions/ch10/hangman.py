@@ -1,4 +1,5 @@
 import wordlist
+from hangman_engine import Game
 
 # Get a random word from the word list
 def get_word():
@@ -11,13 +12,13 @@ def add_spaces(word):
     return word_with_spaces
 
 # Draw the display
-def draw_screen(num_wrong, num_guesses, guessed_letters, displayed_word):
+def draw_screen(game):
     print("-" * 79)
-    draw_hangman(num_wrong)
-    print("Word:", add_spaces(displayed_word),
-          "  Guesses:", num_guesses,
-          "  Wrong:", num_wrong,
-          "  Tried:", add_spaces(guessed_letters))
+    draw_hangman(game.num_wrong)
+    print("Word:", add_spaces(game.displayed_word),
+          "  Guesses:", game.num_guesses,
+          "  Wrong:", game.num_wrong,
+          "  Tried:", add_spaces(game.guessed_letters))
 
 def draw_hangman(num_wrong):
     print("____")
@@ -51,17 +52,17 @@ def draw_hangman(num_wrong):
         print("   / \\\n")
 
 # Get next letter from user
-def get_letter(guessed_letters):
+def get_letter(game):
     while True:
         guess = input("Enter a letter: ").strip().upper()
     
         # Make sure the user enters a letter and only one letter
-        if guess == "" or len(guess) > 1:
+        if len(guess) != 1 or not ("A" <= guess <= "Z"):
             print("Invalid entry. ",
                   "Please enter one and only one letter.")
             continue
         # Don't let the user try the same letter more than once
-        elif guess in guessed_letters:
+        elif game.has_guessed(guess):
             print("You already tried that letter.")
             continue
         else:
@@ -69,45 +70,21 @@ def get_letter(guessed_letters):
 
 # The input/process/draw technique is common in game programming
 def play_game():
-    word = get_word()
-    
-    word_length = len(word)
-    remaining_letters = word_length
-    displayed_word = "_" * word_length
-
-    num_wrong = 0               
-    num_guesses = 0
-    guessed_letters = ""
-
-    draw_screen(num_wrong, num_guesses, guessed_letters, displayed_word)
-
-    while num_wrong < 7 and remaining_letters > 0:
-        guess = get_letter(guessed_letters)
-        guessed_letters += guess
-        
-        pos = word.find(guess, 0)
-        if pos != -1:
-            displayed_word = ""
-            remaining_letters = word_length
-            for char in word:
-                if char in guessed_letters:
-                    displayed_word += char
-                    remaining_letters -= 1
-                else:
-                    displayed_word += "_"              
-        else:
-            num_wrong += 1
+    game = Game(get_word(), max_wrong=7)
 
-        num_guesses += 1
+    draw_screen(game)
 
-        draw_screen(num_wrong, num_guesses, guessed_letters, displayed_word)
+    while not game.is_over:
+        guess = get_letter(game)
+        game.guess(guess)
+        draw_screen(game)
 
     print("-" * 79)
-    if remaining_letters == 0:
-        print(f"Congratulations! You got it in {num_guesses} guesses.")    
-    else:    
+    if game.is_won:
+        print(f"Congratulations! You got it in {game.num_guesses} guesses.")
+    else:
         print("Sorry, you lost.")
-        print(f"The word was: {word}")
+        print(f"The word was: {game.word}")
 
 def main():
     print("Play the H A N G M A N game")
@@ -0,0 +1,72 @@
+import threading, time
+
+class AutoSaver:
+    """Saves task list changes on a background thread.
+
+    Edits are saved once no new edit has arrived for `delay` seconds,
+    but never later than `max_delay` seconds after the first unsaved edit.
+    """
+
+    def __init__(self, save, delay=1.0, max_delay=5.0):
+        self.__save = save   # function that takes a list name and a TaskList
+        self.delay = delay
+        self.maxDelay = max_delay
+        self.__condition = threading.Condition()
+        self.__saveLock = threading.Lock()   # keeps saves in the order edits were made
+        self.__dirty = {}    # name -> TaskList with unsaved edits
+        self.__firstEdit = None
+        self.__lastEdit = None
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def notify(self, name, tasks):
+        # record that a task list was edited
+        with self.__condition:
+            now = time.monotonic()
+            self.__dirty[name] = tasks
+            if self.__firstEdit is None:
+                self.__firstEdit = now
+            self.__lastEdit = now
+            self.__condition.notify()
+
+    def flush(self):
+        # save all pending edits now
+        with self.__saveLock:
+            with self.__condition:
+                dirty = self.__dirty
+                self.__dirty = {}
+                self.__firstEdit = None
+                self.__lastEdit = None
+            for name, tasks in dirty.items():
+                try:
+                    self.__save(name, tasks)
+                except Exception as e:
+                    # the save put the changes back, so keep the
+                    # list dirty and try again after the next delay
+                    print(f"Autosave of {name} task list failed: {e}")
+                    self.notify(name, tasks)
+
+    def close(self):
+        # save all pending edits and stop the background thread
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+        self.flush()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                if self.__closed:
+                    return
+                if len(self.__dirty) == 0:
+                    self.__condition.wait()
+                    continue
+                due = min(self.__lastEdit + self.delay,
+                          self.__firstEdit + self.maxDelay)
+                wait_time = due - time.monotonic()
+                if wait_time > 0:
+                    self.__condition.wait(wait_time)
+                    continue
+            self.flush()
@@ -1,14 +1,56 @@
-import csv
+import csv, io, os, threading
+from concurrent.futures import ThreadPoolExecutor
 from objects import Task, TaskList
 
+# Each task list is stored in up to four files:
+#   task_list_<name>.csv     - base file with one row per task (description, completed, id)
+#   task_list_<name>.log     - change records appended since the last compaction
+#   task_list_<name>.log.old - change records that are being compacted
+#   task_list_<name>.idx     - next task ID, number of records in the log,
+#                              and number of rows in the base file
+
+TASK_LISTS_FILENAME = "task_lists.txt"
+# Compact once the log holds COMPACT_RATIO records for each row in the
+# base file, so a big list isn't rewritten every few edits, but never
+# before it holds COMPACT_MIN_RECORDS, so a small list isn't either.
+COMPACT_RATIO = 0.5
+COMPACT_MIN_RECORDS = 1000
+
+# fields in each kind of log record: action, id[, description, completed]
+LOG_FIELDS = {"add": 4, "complete": 2, "delete": 2}
+
+lock = threading.Lock()
+compactors = {}  # name -> background compaction thread
+
+def get_filename(name, ext="csv"):
+    return "task_list_" + name.lower() + "." + ext
+
 def get_task_list_names():
     task_lists = []
-    with open("task_lists.txt") as file:
+    with open(TASK_LISTS_FILENAME) as file:
         for line in file:
             line = line.replace("\n", "")
             task_lists.append(line)
     return task_lists
 
+def read_index(name):
+    # return (next ID, log records, base rows)
+    try:
+        with open(get_filename(name, "idx")) as file:
+            fields = [int(field) for field in file.read().split(",")]
+    except FileNotFoundError:
+        return 0, 0, 0
+    if len(fields) == 2:
+        fields.append(0)   # written before the base rows were counted
+    return tuple(fields)
+
+def write_index(name, next_id, log_count, base_count):
+    # write a temporary file and rename it so the index is never half-written
+    temp_filename = get_filename(name, "idx.tmp")
+    with open(temp_filename, "w") as file:
+        file.write(f"{next_id},{log_count},{base_count}")
+    os.replace(temp_filename, get_filename(name, "idx"))
+
 def write_task_list(name, tasks):
     # convert the TaskList object to a list of lists
     rows = []
@@ -16,32 +58,203 @@ def write_task_list(name, tasks):
         row = []
         row.append(task.description)
         row.append(task.completed)
+        row.append(task.id)
         rows.append(row)
 
-    # write list of lists to CSV file
-    filename = "task_list_" + name.lower() + ".csv"    
-    with open(filename, "w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerows(rows)
+    # let a running compaction finish so it can't overwrite this save
+    thread = compactors.get(name)
+    if thread:
+        thread.join()
+
+    # write list of lists to a temporary CSV file, replace the
+    # old file with it, and discard any pending changes
+    with lock:
+        temp_filename = get_filename(name, "csv.tmp")
+        with open(temp_filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+        os.replace(temp_filename, get_filename(name))
+        for ext in ("log", "log.old"):
+            if os.path.exists(get_filename(name, ext)):
+                os.remove(get_filename(name, ext))
+        write_index(name, tasks.nextId, 0, len(rows))
+    tasks.takeChanges()
+
+def save_task_list_changes(name, tasks):
+    # append only the changes made since the list was loaded or last saved
+    changes = tasks.takeChanges()
+    if len(changes) == 0:
+        return
+
+    rows = []
+    for action, task in changes:
+        if action == "add":
+            rows.append([action, task.id, task.description, task.completed])
+        else:
+            rows.append([action, task.id])
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerows(rows)
+
+    try:
+        log_count, base_count = append_log(name, tasks, len(rows), buffer.getvalue())
+    except Exception:
+        tasks.restoreChanges(changes)   # so the next save tries them again
+        raise
+
+    if log_count >= max(COMPACT_MIN_RECORDS, base_count * COMPACT_RATIO):
+        start_compaction(name)
+
+def append_log(name, tasks, count, records):
+    # add the records to the log and return (log records, base rows)
+    with lock:
+        next_id, log_count, base_count = read_index(name)
+        next_id = max(next_id, tasks.nextId)
+        log_count += count
+        # write the index first so a crash can never cause an ID to be reused
+        write_index(name, next_id, log_count, base_count)
+        # Copy the log and the new records to a temporary file and rename
+        # it over the log, so a crash leaves the old log or the new one but
+        # never part of a record. Compaction keeps the log small, so the
+        # copy is cheap.
+        log = get_filename(name, "log")
+        try:
+            with open(log, newline="") as file:
+                text = complete_records(file.read())
+        except FileNotFoundError:
+            text = ""
+        temp_filename = get_filename(name, "log.tmp")
+        with open(temp_filename, "w", newline="") as file:
+            file.write(text + records)
+        os.replace(temp_filename, log)
+    return log_count, base_count
+
+def complete_records(text):
+    # drop a last record that a crash cut off before its line ending
+    if not text.endswith("\n"):
+        text = text[:text.rfind("\n") + 1]
+    return text
+
+def read_log(file, added, completed, deleted):
+    # ignore a last record that was cut off by a crash, and any
+    # record with the wrong number of fields or an ID that isn't a number
+    text = complete_records(file.read())
+    for row in csv.reader(io.StringIO(text, newline="")):
+        if len(row) == 0 or len(row) != LOG_FIELDS.get(row[0]):
+            continue
+        try:
+            action, id = row[0], int(row[1])
+        except ValueError:
+            continue
+        if action == "add":
+            added[id] = Task(row[2], row[3] == "True", id)
+        elif action == "complete":
+            if id in added:
+                added[id].completed = True
+            else:
+                completed.add(id)
+        elif action == "delete":
+            if id in added:
+                del added[id]
+            else:
+                deleted.add(id)
+
+def iter_tasks(name, include_log=True):
+    # open every file while holding the lock so a compaction
+    # that finishes during the read can't mix old and new files
+    files = []
+    with lock:
+        exts = ["csv", "log.old"]
+        if include_log:
+            exts.append("log")
+        for ext in exts:
+            try:
+                files.append(open(get_filename(name, ext), newline=""))
+            except FileNotFoundError:
+                files.append(None)
+    base, logs = files[0], files[1:]
+
+    try:
+        # the log is kept small by compaction, so it's read into memory
+        # while the (possibly huge) base file is streamed row by row
+        added, completed, deleted = {}, set(), set()
+        for log in logs:
+            if log:
+                read_log(log, added, completed, deleted)
+
+        if base:
+            reader = csv.reader(base)
+            for line_number, row in enumerate(reader, start=1):
+                # rows written before IDs were stored use their line number
+                id = int(row[2]) if len(row) > 2 else line_number
+                if id in deleted:
+                    continue
+                task = Task(row[0], row[1] == "True", id)
+                if id in completed:
+                    task.completed = True
+                yield task
+
+        for task in added.values():
+            yield task
+    finally:
+        for file in files:
+            if file:
+                file.close()
 
 def get_task_list(name):
-    filename = "task_list_" + name.lower() + ".csv"
-    tasks = TaskList(name)
-    with open(filename, newline="") as file:
-        reader = csv.reader(file)
-        for row in reader:
-            # convert row to Task object
-            task = Task(row[0])
-            if row[1] == 'True':
-                task.completed = True
-            tasks.addTask(task)
+    next_id, log_count, base_count = read_index(name)
+    tasks = TaskList(name, max(next_id, 1))
+    for task in iter_tasks(name):
+        tasks.addTask(task)
+    tasks.takeChanges()  # loaded tasks are already saved
     return tasks
 
+def get_all_task_lists():
+    # load every task list at the same time, one per worker thread
+    names = get_task_list_names()
+    with ThreadPoolExecutor() as executor:
+        task_lists = executor.map(get_task_list, names)
+        return dict(zip(names, task_lists))
+
+def compact_task_list(name):
+    # move the current log aside so new changes can keep being appended
+    with lock:
+        log = get_filename(name, "log")
+        old_log = get_filename(name, "log.old")
+        if os.path.exists(log) and not os.path.exists(old_log):
+            os.rename(log, old_log)
+            next_id, log_count, base_count = read_index(name)
+            write_index(name, next_id, 0, base_count)
+        elif not os.path.exists(old_log):
+            return
+
+    # merge the base file and the old log into a new base file
+    temp_filename = get_filename(name, "csv.compact")
+    rows = 0
+    with open(temp_filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        for task in iter_tasks(name, include_log=False):
+            writer.writerow([task.description, task.completed, task.id])
+            rows += 1
+
+    with lock:
+        os.replace(temp_filename, get_filename(name))
+        os.remove(old_log)
+        next_id, log_count, base_count = read_index(name)
+        write_index(name, next_id, log_count, rows)
+
+def start_compaction(name):
+    thread = compactors.get(name)
+    if thread and thread.is_alive():
+        return
+    thread = threading.Thread(target=compact_task_list, args=(name,))
+    compactors[name] = thread
+    thread.start()
+
 def main():
     task_list_names = get_task_list_names()
     name = task_list_names[0]
     tasks = TaskList(name)
-    
+
     task1 = Task("Buy toothbrush")
     tasks.addTask(task1)
     task2 = Task("Do homework")
@@ -51,7 +264,7 @@ def main():
 
     tasks = get_task_list(name)
     print(tasks)
-    
-    
+
+
 if __name__ == "__main__":
     main()
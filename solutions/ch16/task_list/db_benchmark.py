@@ -0,0 +1,58 @@
+import os, tempfile, time
+
+import db
+import db_sqlite
+from objects import Task, TaskList
+
+# compares the CSV and SQLite task list storage for one large list
+
+TASK_COUNT = 100000
+
+def make_task_list(name, count):
+    tasks = TaskList(name)
+    for i in range(count):
+        tasks.addTask(Task(f"Task number {i}"))
+    return tasks
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:36} {elapsed * 1000:10.2f} ms")
+    return result
+
+def run_benchmark(module, label):
+    name = "Benchmark"
+    tasks = make_task_list(name, TASK_COUNT)
+    timed(f"{label}: write whole list", module.write_task_list, name, tasks)
+    tasks = timed(f"{label}: load list", module.get_task_list, name)
+
+    tasks.completeTask(tasks.getTask(TASK_COUNT // 2))
+    timed(f"{label}: save one completed task", module.save_task_list_changes,
+          name, tasks)
+
+    tasks.removeTask(tasks.getTask(1))
+    timed(f"{label}: save one deleted task", module.save_task_list_changes,
+          name, tasks)
+
+    tasks.addTask(Task("One more task"))
+    timed(f"{label}: save one added task", module.save_task_list_changes,
+          name, tasks)
+
+def main():
+    print(f"Task list with {TASK_COUNT:,} tasks")
+    print()
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            run_benchmark(db, "CSV")
+            print()
+            run_benchmark(db_sqlite, "SQLite")
+            db_sqlite.close()
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
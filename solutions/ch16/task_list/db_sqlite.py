@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import db as csv_db
+from objects import Task, TaskList
+
+# SQLite version of db.py - to use it, change the import
+# in task_list.py to:  import db_sqlite as db
+
+DB_FILE = "task_lists.sqlite"
+
+# The autosave thread saves changes while the main thread reads, so the
+# one connection is shared between threads and used by one at a time.
+conn = None
+lock = threading.RLock()
+
+def connect():
+    global conn
+    if not conn:
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        create_tables()
+
+def close():
+    global conn
+    if conn:
+        conn.close()
+        conn = None
+
+def create_tables():
+    script = '''CREATE TABLE IF NOT EXISTS TaskList (
+                    listID   INTEGER PRIMARY KEY,
+                    name     TEXT NOT NULL UNIQUE,
+                    nextID   INTEGER NOT NULL DEFAULT 1);
+                CREATE TABLE IF NOT EXISTS Task (
+                    listID      INTEGER NOT NULL,
+                    taskID      INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    completed   INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (listID, taskID));
+                CREATE INDEX IF NOT EXISTS TaskCompleted
+                    ON Task (listID, completed);'''
+    with closing(conn.cursor()) as c:
+        c.executescript(script)
+
+def get_list_id(name):
+    # get the ID for a task list, adding the list if it doesn't exist yet
+    with closing(conn.cursor()) as c:
+        c.execute("INSERT OR IGNORE INTO TaskList (name) VALUES (?)", (name,))
+        c.execute("SELECT listID FROM TaskList WHERE name = ?", (name,))
+        return c.fetchone()["listID"]
+
+def get_task_list_names():
+    with lock:
+        connect()
+        query = "SELECT name FROM TaskList ORDER BY listID"
+        with closing(conn.cursor()) as c:
+            c.execute(query)
+            results = c.fetchall()
+            if len(results) == 0:
+                # a new database: copy the CSV task lists into it first
+                if not os.path.exists(csv_db.TASK_LISTS_FILENAME):
+                    raise FileNotFoundError(
+                        f"{DB_FILE} has no task lists and there is no "
+                        f"{csv_db.TASK_LISTS_FILENAME} to copy them from.")
+                migrate_from_csv()
+                c.execute(query)
+                results = c.fetchall()
+
+        task_lists = []
+        for row in results:
+            task_lists.append(row["name"])
+        return task_lists
+
+def make_task(row):
+    return Task(row["description"], row["completed"] == 1, row["taskID"])
+
+def get_task_list(name, completed=None):
+    # completed can be True or False to load only completed or pending tasks
+    with lock:
+        connect()
+        with conn:
+            list_id = get_list_id(name)
+        query = '''SELECT taskID, description, completed
+                   FROM Task WHERE listID = ?'''
+        params = [list_id]
+        if completed is not None:
+            query += " AND completed = ?"
+            params.append(int(completed))
+        query += " ORDER BY taskID"
+
+        with closing(conn.cursor()) as c:
+            c.execute("SELECT nextID FROM TaskList WHERE listID = ?", (list_id,))
+            tasks = TaskList(name, c.fetchone()["nextID"])
+            c.execute(query, params)
+            for row in c:
+                tasks.addTask(make_task(row))
+        tasks.takeChanges()  # loaded tasks are already saved
+        return tasks
+
+def get_all_task_lists():
+    # the connection is used by one thread at a time, so load lists in turn
+    task_lists = {}
+    for name in get_task_list_names():
+        task_lists[name] = get_task_list(name)
+    return task_lists
+
+def write_task_list(name, tasks):
+    # replace every task in the list
+    with lock:
+        connect()
+        with conn:
+            list_id = get_list_id(name)
+            with closing(conn.cursor()) as c:
+                c.execute("DELETE FROM Task WHERE listID = ?", (list_id,))
+                c.executemany('''INSERT INTO Task (listID, taskID, description, completed)
+                                 VALUES (?, ?, ?, ?)''',
+                              [(list_id, task.id, task.description, int(task.completed))
+                               for task in tasks])
+                c.execute("UPDATE TaskList SET nextID = ? WHERE listID = ?",
+                          (tasks.nextId, list_id))
+        tasks.takeChanges()
+
+def save_task_list_changes(name, tasks):
+    # apply only the changes made since the list was loaded or last saved
+    changes = tasks.takeChanges()
+    if len(changes) == 0:
+        return
+
+    try:
+        with lock:
+            apply_changes(name, tasks, changes)
+    except Exception:
+        tasks.restoreChanges(changes)   # so the next save tries them again
+        raise
+
+def apply_changes(name, tasks, changes):
+    connect()
+    with conn:
+        list_id = get_list_id(name)
+        with closing(conn.cursor()) as c:
+            for action, task in changes:
+                if action == "add":
+                    c.execute('''INSERT OR REPLACE INTO Task
+                                     (listID, taskID, description, completed)
+                                 VALUES (?, ?, ?, ?)''',
+                              (list_id, task.id, task.description, int(task.completed)))
+                elif action == "complete":
+                    c.execute('''UPDATE Task SET completed = 1
+                                 WHERE listID = ? AND taskID = ?''',
+                              (list_id, task.id))
+                elif action == "delete":
+                    c.execute("DELETE FROM Task WHERE listID = ? AND taskID = ?",
+                              (list_id, task.id))
+            c.execute('''UPDATE TaskList SET nextID = MAX(nextID, ?)
+                         WHERE listID = ?''', (tasks.nextId, list_id))
+
+def migrate_from_csv():
+    # copy every task list named in task_lists.txt into the database
+    for name in csv_db.get_task_list_names():
+        tasks = csv_db.get_task_list(name)
+        write_task_list(name, tasks)
+        print(f"{name}: {tasks.count} tasks migrated.")
+
+def main():
+    connect()
+    for name in get_task_list_names():
+        print(f"{name}: {get_task_list(name)}")
+    close()
+
+
+if __name__ == "__main__":
+    main()
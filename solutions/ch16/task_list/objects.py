@@ -1,9 +1,12 @@
+import threading
 from dataclasses import dataclass
+from itertools import islice
 
 @dataclass
 class Task:
     description:str = ""
     completed:bool = False
+    id:int = 0
 
     def __str__(self):
         completed_str = ""
@@ -14,31 +17,81 @@ class Task:
 @dataclass
 class TaskList:
     name:str = ""
+    nextId:int = 1
 
     def __post_init__(self): 
-        self.__tasks = []
+        # dicts keep tasks in the order they were added and
+        # let a task be found or removed by its ID in O(1) time
+        self.__tasks = {}
+        self.__pending = {}
+        self.__changes = []   # changes made since the list was last saved
+        # the changes are taken by the autosave thread while the
+        # main thread is still adding to them
+        self.__changesLock = threading.Lock()
 
     def addTask(self, task):
-        self.__tasks.append(task)
+        # give new tasks an ID that is never reused within this list
+        if task.id == 0:
+            task.id = self.nextId
+        self.nextId = max(self.nextId, task.id + 1)
+        self.__tasks[task.id] = task
+        if not task.completed:
+            self.__pending[task.id] = task
+        with self.__changesLock:
+            self.__changes.append(("add", task))
 
     def getTask(self, number):
         index = number - 1
-        return self.__tasks[index]      
+        if index < 0 or index >= len(self.__tasks):
+            raise IndexError("task number out of range")
+        return next(islice(self.__tasks.values(), index, None))
+
+    def getTaskById(self, id):
+        return self.__tasks.get(id)
+
+    def completeTask(self, task):
+        task.completed = True
+        self.__pending.pop(task.id, None)
+        with self.__changesLock:
+            self.__changes.append(("complete", task))
 
     def removeTask(self, task):
-        self.__tasks.remove(task)
+        del self.__tasks[task.id]
+        self.__pending.pop(task.id, None)
+        with self.__changesLock:
+            self.__changes.append(("delete", task))
+
+    def takeChanges(self):
+        # return the changes since the last call and start a new batch
+        with self.__changesLock:
+            changes = self.__changes
+            self.__changes = []
+        return changes
+
+    def restoreChanges(self, changes):
+        # put back changes that couldn't be saved, ahead of any newer ones
+        with self.__changesLock:
+            self.__changes = changes + self.__changes
 
     @property
     def count(self):
         return len(self.__tasks)    
 
+    @property
+    def pendingCount(self):
+        return len(self.__pending)
+
+    @property
+    def completedCount(self):
+        return len(self.__tasks) - len(self.__pending)
+
+    def pendingTasks(self):
+        for task in self.__pending.values():
+            yield task
+
     def __iter__(self):
-        for task in self.__tasks:
+        for task in self.__tasks.values():
             yield task
 
     def __str__(self):
-        tasks_str = ""
-        for task in self.__tasks:
-            tasks_str += str(task) + " | "
-        tasks_str = tasks_str[:-3] # remove final separator 
-        return tasks_str
+        return " | ".join(str(task) for task in self.__tasks.values())
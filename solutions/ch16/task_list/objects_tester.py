@@ -10,10 +10,12 @@ tasks.addTask(task2)
 tasks.addTask(task3)
 
 task = tasks.getTask(1)
-task.completed = True
+tasks.completeTask(task)
 
 print(tasks)
+print(tasks.pendingCount, "pending,", tasks.completedCount, "completed")
 
 tasks.removeTask(task)
 
 print(tasks)
+print(tasks.pendingCount, "pending,", tasks.completedCount, "completed")
@@ -0,0 +1,44 @@
+import re
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def get_words(text):
+    return set(WORD_PATTERN.findall(text.lower()))
+
+class TaskIndex:
+    """Inverted index that maps each word in a task description
+    to the tasks in any task list that contain that word."""
+
+    def __init__(self):
+        self.__words = {}   # word -> {(list name, task ID): (list name, task)}
+
+    def addTaskList(self, name, tasks):
+        for task in tasks:
+            self.addTask(name, task)
+
+    def addTask(self, name, task):
+        key = (name, task.id)
+        for word in get_words(task.description):
+            self.__words.setdefault(word, {})[key] = (name, task)
+
+    def removeTask(self, name, task):
+        key = (name, task.id)
+        for word in get_words(task.description):
+            matches = self.__words.get(word)
+            if matches:
+                matches.pop(key, None)
+                if len(matches) == 0:
+                    del self.__words[word]
+
+    def search(self, text):
+        # return (list name, task) tuples for tasks that contain every word
+        words = get_words(text)
+        if len(words) == 0:
+            return []
+
+        # start with the rarest word so the other lookups check fewer tasks
+        match_sets = sorted((self.__words.get(word, {}) for word in words), key=len)
+        keys = match_sets[0].keys()
+        for matches in match_sets[1:]:
+            keys = keys & matches.keys()
+        return [match_sets[0][key] for key in sorted(keys)]
@@ -1,5 +1,7 @@
 import db
+from autosave import AutoSaver
 from objects import Task, TaskList
+from task_index import TaskIndex
 
 def display_task_list_names():
     names = db.get_task_list_names()
@@ -22,11 +24,11 @@ def get_int(prompt, maxNum):
         else:
             return number
 
-def select_task_list():
-    names = db.get_task_list_names()
+def select_task_list(task_lists):
+    names = list(task_lists.keys())
     num = get_int("Enter number to select task list: ", len(names))
     name = names[num-1]
-    tasks = db.get_task_list(name)
+    tasks = task_lists[name]
     print(f"{name} task list was selected.\n")
     return name, tasks  # return tuple
 
@@ -38,32 +40,55 @@ def list_tasks(tasks):
             print(f"{i}. {task}")
         print()
 
+def list_pending_tasks(tasks):
+    if tasks.pendingCount == 0:
+        print("There are no pending tasks in this list.\n")
+    else:
+        for task in tasks.pendingTasks():
+            print(f"- {task}")
+        print()
+    print(f"{tasks.pendingCount} pending, {tasks.completedCount} completed\n")
+
 def add_task(tasks):
     description = input("Description: ")
     task = Task(description)
     tasks.addTask(task)
     print()
+    return task
 
 def delete_task(tasks):
     number = get_int("Number: ", tasks.count)
     task = tasks.getTask(number)
     tasks.removeTask(task)
     print()
+    return task
         
 def complete_task(tasks):
     number = get_int("Number: ", tasks.count)   
     task = tasks.getTask(number)
-    task.completed = True
+    tasks.completeTask(task)
     print()
         
+def search_tasks(index):
+    text = input("Search for: ")
+    results = index.search(text)
+    if len(results) == 0:
+        print("No matching tasks were found.\n")
+    else:
+        for name, task in results:
+            print(f"{name}: {task}")
+        print()
+
 def display_menu():
     print("The Task List program")
     print()
     print("COMMAND MENU")
     print("list     - List all tasks")
+    print("pending  - List pending tasks")
     print("add      - Add a task")
     print("complete - Complete a task")
     print("delete   - Delete a task")
+    print("search   - Search all task lists")
     print("switch   - Switch selected task list")
     print("exit     - Exit program")
     print()
@@ -72,23 +97,38 @@ def main():
     display_menu()
     display_task_list_names()
 
-    name, tasks = select_task_list()
+    task_lists = db.get_all_task_lists()
+    index = TaskIndex()
+    for list_name, task_list in task_lists.items():
+        index.addTaskList(list_name, task_list)
+
+    name, tasks = select_task_list(task_lists)
+    saver = AutoSaver(db.save_task_list_changes)
     
     while True:        
         command = input("Command: ")
         if command.lower() == "list":
             list_tasks(tasks)     
+        elif command.lower() == "pending":
+            list_pending_tasks(tasks)
         elif command.lower() == "add":
-            add_task(tasks)
+            task = add_task(tasks)
+            index.addTask(name, task)
+            saver.notify(name, tasks)
         elif command.lower() == "delete":
-            delete_task(tasks)       
+            task = delete_task(tasks)
+            index.removeTask(name, task)
+            saver.notify(name, tasks)
         elif command.lower() == "complete":
             complete_task(tasks)    
+            saver.notify(name, tasks)
+        elif command.lower() == "search":
+            search_tasks(index)
         elif command.lower() == "switch":
-            db.write_task_list(name, tasks)  # save changes
-            name, tasks = select_task_list()
+            saver.flush()  # save changes
+            name, tasks = select_task_list(task_lists)
         elif command.lower() == "exit":
-            db.write_task_list(name, tasks)  # save changes
+            saver.close()  # save changes
             print("Bye!")
             break
         else: